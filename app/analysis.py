@@ -0,0 +1,143 @@
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from functools import lru_cache
+from core.parser import CVPipeline
+from core.dedup import deduplicate
+from core.profiling import tracer
+
+log = logging.getLogger(__name__)
+
+# Porsi progress bar per tahap
+PARSE_SHARE, SCORE_SHARE = 0.3, 0.3
+SUMMARY_PENDING = "_Generating summary..._"
+SUMMARY_MISSING = "_No AI summary yet: run the analysis again with these weights to generate one._"
+
+
+def archive_async(files, dest_folder) -> threading.Thread:
+    """Write uploaded (name, bytes) pairs to a timestamped folder in the background."""
+    ts_folder = Path(dest_folder) / datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def write():
+        ts_folder.mkdir(parents=True, exist_ok=True)
+        for name, data in files:
+            (ts_folder / Path(name).name).write_bytes(data)
+
+    t = threading.Thread(target=write, name="cv-archive", daemon=True)
+    t.start()
+    return t
+
+
+def rerank_top(scored, weights: dict, top_n: int, summaries: dict = None):
+    """Top N of a scored frame for new weights; AI summaries already generated are kept per cv_id."""
+    from core.rerank import rerank
+
+    df_top = rerank(scored, weights, top_n)
+    df_top["AI_Summary"] = [(summaries or {}).get(cv_id, SUMMARY_MISSING) for cv_id in df_top["cv_id"]]
+    return df_top
+
+
+@lru_cache(maxsize=512)
+def _cached_summary(prompt_text):
+    from llm import get_llm_model
+    return get_llm_model().generate(prompt_text)
+
+
+def run_analysis(ctx, source, job: dict, top_n: int, encoder=None, summaries: bool = True, archive_to=None,
+                 dedup: bool = True, components=None, languages=()):
+    """
+    Background analysis task for JobManager: parse -> score -> top N -> LLM summaries.
+
+    `source` is a folder of PDFs or a list of (name, bytes) uploads; uploads are
+    parsed from memory and only written to `archive_to` (if given) in parallel.
+
+    Publishes "duplicates" (near-duplicate clusters, only one CV per cluster is
+    scored), "scored" (full ranked frame with the raw components, so the UI can
+    rerank() it for new weights) and "top" (top N, updated after every summary)
+    so the UI can render results while summaries are still running.
+
+    components: a ComponentStore; a pool already scored for the same job (any
+    weights) is then only re-ranked. languages: CVPipeline header languages
+    besides English.
+    """
+    if tracer.enabled:
+        # run id sendiri per job; UI menampilkan trace job ini saja
+        ctx.publish("trace_run", tracer.new_run())
+
+    # ===== PARSE =====
+    ctx.progress("parse", 0.0, "Parsing CVs...")
+    on_parsed = lambda done, total: ctx.progress(
+        "parse", PARSE_SHARE * done / total, f"Parsed {done}/{total} CV(s)"
+    )
+
+    parser = CVPipeline(languages=languages)
+    if isinstance(source, (str, Path)):
+        df = parser.run(source, on_progress=on_parsed)
+    else:
+        if archive_to:
+            archive_async(source, archive_to)
+        df = parser.run_streams(source, on_progress=on_parsed)
+
+    if df.empty:
+        ctx.publish("top", df)
+        return
+
+    # ===== DEDUP =====
+    if dedup:
+        ctx.progress("dedup", PARSE_SHARE, "Detecting duplicate CVs...")
+        df, clusters = deduplicate(df)
+        ctx.publish("duplicates", clusters)
+
+    # ===== SCORE =====
+    from core.rerank import job_hash, pool_manifest, rerank
+
+    key = (pool_manifest(df), job_hash(job)) if components is not None else None
+    stored = components.load(*key) if key else None
+    if stored is not None:
+        # pool + job sama seperti sebelumnya: cukup hitung ulang bobot
+        with tracer.stage("score.rerank", items=len(stored)):
+            result = rerank(stored, job["weights"]) if not stored.empty else stored
+    else:
+        from core.scorer import CVScorer
+
+        ctx.progress("score", PARSE_SHARE, "Loading scorer...")
+        scorer = CVScorer(model=encoder, **job)
+        result = scorer.score_dataframe(
+            df,
+            on_progress=lambda stage, i, n: ctx.progress(
+                stage, PARSE_SHARE + SCORE_SHARE * i / n, f"Scoring: {stage.split('.')[-1]}"
+            ),
+        )
+        if key:
+            try:
+                components.save(*key, result)
+            except Exception:
+                # cache skor saja: job tetap selesai tanpa menyimpannya
+                log.warning("could not store component scores", exc_info=True)
+    ctx.publish("scored", result)
+
+    if result.empty:
+        ctx.publish("top", result)
+        return
+
+    df_top = result.sort_values("total_score", ascending=False).head(top_n).reset_index(drop=True)
+    ctx.publish("top", df_top)
+
+    # ===== SUMMARIES =====
+    if not summaries:
+        return
+
+    from llm import build_summary_prompt
+
+    done_share = PARSE_SHARE + SCORE_SHARE
+    df_top["AI_Summary"] = SUMMARY_PENDING
+    with tracer.stage("llm.generate_summaries", items=len(df_top)):
+        for i, row in df_top.iterrows():
+            ctx.progress(
+                "summaries", done_share + (1 - done_share) * i / len(df_top),
+                f"AI summary {i + 1}/{len(df_top)}: {row['cv_id']}"
+            )
+            prompt = build_summary_prompt(row, job["job_title"], job["job_description"], job["required_skills"])
+            df_top.at[i, "AI_Summary"] = _cached_summary(prompt)
+            ctx.publish("top", df_top)
@@ -0,0 +1,261 @@
+"""
+Headless batch scoring: CVPipeline -> CVScorer on a folder, ranked results to CSV/Parquet.
+
+    python app/cli.py --input cvs/ --job job.json --out ranked.csv --workers 4
+    python app/cli.py --input cvs/ --job-title "Data Analyst" --skills "sql, python" --out ranked.parquet
+    python app/cli.py --input cvs/ --job job.json --out ranked.csv --top-n 50 --shard-workers 4
+
+The LLM is only loaded with --summaries; torch / sentence-transformers are only
+imported once parsing is done.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+from core.parser import CVPipeline
+from core.dedup import deduplicate
+
+RESULT_COLUMNS = [
+    "rank", "cv_id", "title", "total_score",
+    "score_skills", "score_experience_final", "score_summary_final", "score_education_final",
+    "summary_raw", "edu_raw", "exp_raw",
+]
+
+DEFAULT_WEIGHTS = {"experience": 40, "skills": 30, "summary": 20, "education": 10}
+
+
+def _split(text):
+    return [s.strip() for s in (text or "").split(",") if s.strip()]
+
+
+def _log(msg):
+    print(f"[cv-insight] {msg}", file=sys.stderr, flush=True)
+
+
+def load_job(args) -> dict:
+    job = json.loads(Path(args.job).read_text(encoding="utf-8")) if args.job else {}
+
+    job_title = args.job_title or job.get("job_title", "")
+    if not job_title:
+        raise SystemExit("A job title is required (--job-title or 'job_title' in --job).")
+
+    weights = dict(DEFAULT_WEIGHTS)
+    weights.update(job.get("weights", {}))
+    for pair in _split(args.weights):
+        k, _, v = pair.partition("=")
+        weights[k.strip()] = float(v)
+
+    # Sama seperti sidebar: bobot dalam persen, total harus 100
+    total = sum(weights.values())
+    if abs(total - 100) > 1e-6:
+        raise SystemExit(f"Total weight must be 100% (current: {total}%)")
+
+    return {
+        "job_title": job_title,
+        "job_description": args.job_description or job.get("job_description", ""),
+        "required_skills": _split(args.skills) or job.get("required_skills", []),
+        "highlight_keywords": _split(args.keywords) or job.get("highlight_keywords", []),
+        "weights": {k: v / 100.0 for k, v in weights.items()},
+    }
+
+
+def _address(text):
+    host, _, port = text.rpartition(":")
+    return (host or "0.0.0.0", int(port))
+
+
+def score_sharded(args, job, folder: Path, parser_options: dict):
+    """Parse + score through a ShardCoordinator with local and/or remote (--listen) workers."""
+    from core.shards import ShardCoordinator, start_local_workers
+
+    authkey = os.getenv("SHARD_AUTHKEY", "").encode() or None
+    if args.listen and not authkey:
+        raise SystemExit("--listen needs SHARD_AUTHKEY (shared with app/shard_worker.py)")
+
+    items = [(p.name, p) for p in sorted(folder.glob("*.pdf"))]
+    if not items:
+        return None
+    job = {**job, "batch_size": args.batch_size, "embedding_dtype": args.embedding_dtype}
+    options = {"model_name": args.model, "backend": args.backend, "threads": args.threads,
+               "max_seq_length": args.max_seq_length}
+
+    with ShardCoordinator(_address(args.listen) if args.listen else ("127.0.0.1", 0), authkey) as coordinator:
+        if args.listen:
+            _log(f"waiting for shard workers on {args.listen}")
+        start_local_workers(args.shard_workers, coordinator.address, coordinator.authkey, **options)
+        result = coordinator.run(
+            items, job, top_k=args.top_n, shard_size=args.shard_size, parser_options=parser_options,
+            dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+            run_options={"workers": args.workers, "cache_dir": args.cache_dir},
+        )
+        stats, clusters = coordinator.stats, coordinator.duplicates
+    _log(f"{stats['shards']} shard(s) on {len(stats['per_worker'])} worker(s), "
+         f"{stats['retries']} retried, {stats['lost_workers']} worker(s) lost")
+    if not args.no_dedup:
+        _log(f"{len(clusters)} duplicate cluster(s) within shards")
+        write_duplicates(clusters, args.duplicates_out)
+    return result
+
+
+def write_duplicates(clusters, out):
+    if out and not clusters.empty:
+        clusters.assign(duplicates=clusters["duplicates"].apply(";".join)).to_csv(out, index=False)
+
+
+def write_results(df, out: Path):
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if out.suffix.lower() == ".parquet":
+        df.to_parquet(out, index=False)
+    else:
+        df.to_csv(out, index=False)
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(
+        prog="cv-insight",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("--input", required=True, help="folder containing CV PDFs")
+    ap.add_argument("--out", required=True, help="output file (.csv or .parquet)")
+    ap.add_argument("--job", help="JSON file with job_title, job_description, required_skills, highlight_keywords, weights")
+    ap.add_argument("--job-title")
+    ap.add_argument("--job-description")
+    ap.add_argument("--skills", help="required skills, comma separated")
+    ap.add_argument("--keywords", help="highlight keywords, comma separated")
+    ap.add_argument("--weights", help="percentages, e.g. experience=40,skills=30,summary=20,education=10")
+    ap.add_argument("--top-n", type=int, default=None, help="only write the N best CVs")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="parallel PDF parsing processes (per shard worker with --shard-workers / --listen)")
+    ap.add_argument("--batch-size", type=int, default=32, help="sentence encoder batch size")
+    ap.add_argument("--cache-dir", default=None,
+                    help="cache parsed CVs by file content across runs (a path on each shard worker's host when sharded)")
+    ap.add_argument("--extraction", choices=["text", "layout"], default="text",
+                    help="'layout' uses font size/boldness for headers and stops after the last section")
+    ap.add_argument("--max-pages", type=int, default=None, help="page cap per CV (layout extraction)")
+    ap.add_argument("--languages", default="id",
+                    help="header languages recognized besides English, comma separated ('' for English only)")
+    ap.add_argument("--headers", default=None, help="JSON file with extra section header aliases {feature: [alias, ...]}")
+    ap.add_argument("--compact", action="store_true",
+                    help="memory-compact frame for large pools (categorical titles, Arrow strings, no raw text)")
+    ap.add_argument("--no-dedup", action="store_true", help="score every CV, including duplicates")
+    ap.add_argument("--dedup-threshold", type=float, default=0.8, help="estimated Jaccard for near duplicates")
+    ap.add_argument("--duplicates-out", default=None, help="write duplicate clusters to this CSV")
+    ap.add_argument("--model", default="all-MiniLM-L6-v2", help="sentence-transformers model name")
+    ap.add_argument("--backend", choices=["torch", "torch-int8"], default="torch",
+                    help="encoder inference backend")
+    ap.add_argument("--threads", type=int, default=None, help="encoder intra-op threads (per worker with --encode-workers)")
+    ap.add_argument("--encode-workers", type=int, default=1, help="encoder processes for scoring large pools")
+    ap.add_argument("--max-seq-length", type=int, default=None, help="truncate encoder inputs to this many tokens")
+    ap.add_argument("--embedding-dtype", choices=["float32", "float16", "int8"], default="float32",
+                    help="compute similarities on embeddings quantized to this dtype")
+    ap.add_argument("--shard-workers", type=int, default=0,
+                    help="parse + score in N local worker processes through the shard coordinator "
+                         "(duplicates are only removed within a shard)")
+    ap.add_argument("--shard-size", type=int, default=200, help="CVs per shard with --shard-workers / --listen")
+    ap.add_argument("--listen", default=None,
+                    help="HOST:PORT to accept remote shard workers (app/shard_worker.py, needs SHARD_AUTHKEY)")
+    ap.add_argument("--summaries", action="store_true", help="generate LLM summaries for the written rows")
+    ap.add_argument("--summary-top", type=int, default=20, help="max rows to summarize with --summaries")
+    return ap
+
+
+def main(argv=None):
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    if (args.shard_workers or args.listen) and args.encode_workers > 1:
+        # tiap shard worker sudah satu proses encoder; pakai --threads per worker
+        ap.error("--encode-workers cannot be combined with --shard-workers / --listen (use --threads)")
+    unknown = set(_split(args.languages)) - set(CVPipeline.LANGUAGE_HEADERS)
+    if unknown:
+        ap.error(f"unknown --languages {sorted(unknown)}, expected any of {sorted(CVPipeline.LANGUAGE_HEADERS)}")
+    job = load_job(args)
+
+    folder = Path(args.input)
+    if not folder.is_dir():
+        raise SystemExit(f"Input folder does not exist: {folder}")
+
+    t0 = time.perf_counter()
+    parser_options = {
+        "extraction": args.extraction,
+        "max_pages": args.max_pages,
+        "languages": tuple(_split(args.languages)),
+        "header_aliases": CVPipeline.load_header_aliases(args.headers) if args.headers else None,
+        "compact": args.compact,
+    }
+
+    if args.shard_workers or args.listen:
+        result = score_sharded(args, job, folder, parser_options)
+        if result is None:
+            _log("no PDFs found, nothing to score")
+            return 1
+        _log(f"{'ranked the top' if args.top_n else 'scored'} {len(result)} CV(s) in {time.perf_counter() - t0:.1f}s")
+        return finish(args, job, result, t0)
+
+    df = CVPipeline(**parser_options).run(folder, workers=args.workers, cache_dir=args.cache_dir)
+    _log(f"parsed {len(df)} CV(s) in {time.perf_counter() - t0:.1f}s")
+
+    if df.empty:
+        _log("no PDFs found, nothing to score")
+        return 1
+
+    if not args.no_dedup:
+        df, clusters = deduplicate(df, args.dedup_threshold)
+        _log(f"{len(clusters)} duplicate cluster(s); scoring {len(df)} unique CV(s)")
+        write_duplicates(clusters, args.duplicates_out)
+
+    # Import berat (torch / sentence-transformers) baru setelah parsing
+    from core.scorer import CVScorer
+    from core.encoders import load_encoder
+    from core.encode_pool import EncodePool
+
+    t1 = time.perf_counter()
+    options = {"backend": args.backend, "max_seq_length": args.max_seq_length}
+    if args.encode_workers > 1:
+        encoder = EncodePool(args.model, workers=args.encode_workers, threads=args.threads, **options)
+    else:
+        encoder = load_encoder(args.model, threads=args.threads, **options)
+    try:
+        scorer = CVScorer(model=encoder, batch_size=args.batch_size,
+                          embedding_dtype=args.embedding_dtype, **job)
+        result = scorer.score_dataframe(df)
+    finally:
+        if isinstance(encoder, EncodePool):
+            encoder.close()
+    _log(f"scored {len(result)} CV(s) passing the title gate in {time.perf_counter() - t1:.1f}s")
+    if args.top_n:
+        result = result.head(args.top_n)
+    return finish(args, job, result, t0)
+
+
+def finish(args, job, result, t0) -> int:
+    """Rank column, optional LLM summaries, write the output file."""
+    result = result.copy()
+    result.insert(0, "rank", range(1, len(result) + 1))
+    columns = [c for c in RESULT_COLUMNS if c in result.columns]
+
+    if args.summaries and not result.empty:
+        from llm import get_llm_model, build_summary_prompt
+
+        llm = get_llm_model()
+        n = min(args.summary_top, len(result))
+        result["AI_Summary"] = ""
+        for i in range(n):
+            prompt = build_summary_prompt(
+                result.iloc[i], job["job_title"], job["job_description"], job["required_skills"]
+            )
+            result.iat[i, result.columns.get_loc("AI_Summary")] = llm.generate(prompt)
+            _log(f"summary {i + 1}/{n}")
+        columns.append("AI_Summary")
+
+    out = Path(args.out)
+    write_results(result[columns], out)
+    _log(f"wrote {len(result)} row(s) to {out} ({time.perf_counter() - t0:.1f}s total)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from pathlib import Path
+from core.profiling import tracer
 
 def sidebar_inputs():
     st.sidebar.header("Job Details")
@@ -62,6 +62,8 @@ def show_results(df, top_n):
     return df_sorted.head(top_n)
 
 def radar_charts(df_top):
+    import plotly.express as px
+
     st.subheader("Radar Charts for Top CVs")
     categories = ["experience", "skills", "summary", "education"]
 
@@ -94,7 +96,29 @@ def radar_charts(df_top):
 
 
 def bar_chart(df_top):
+    import plotly.express as px
+
     st.subheader("Top CVs Total Score Comparison")
     fig = px.bar(df_top, x="cv_id", y="total_score", color="total_score", text="total_score")
     st.plotly_chart(fig, use_container_width=True)
 
+def duplicates_panel(clusters):
+    if clusters is None or clusters.empty:
+        return
+    removed = int((clusters["size"] - 1).sum())
+    with st.expander(f"Duplicate CVs: {len(clusters)} cluster(s), {removed} copy(ies) not scored"):
+        view = clusters.assign(duplicates=clusters["duplicates"].apply(", ".join))
+        st.dataframe(view[["representative", "duplicates", "size"]], use_container_width=True)
+
+def trace_panel(run_id=None):
+    if not tracer.enabled:
+        return
+    run_id = run_id or tracer.run_id
+    summary = tracer.summary(run_id)
+    if not summary:
+        return
+    with st.expander(f"Performance trace (run {run_id})"):
+        st.dataframe(pd.DataFrame(summary), use_container_width=True)
+        if tracer.path:
+            st.caption(f"Full JSON-lines trace: {tracer.path}")
+
@@ -1,2 +1,9 @@
-from .parser import CVPipeline
-from .scorer import CVScorer
\ No newline at end of file
+# Lazy exports: importing core.parser must not pull in torch via core.scorer
+def __getattr__(name):
+    if name == "CVPipeline":
+        from .parser import CVPipeline
+        return CVPipeline
+    if name == "CVScorer":
+        from .scorer import CVScorer
+        return CVScorer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
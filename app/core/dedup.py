@@ -0,0 +1,145 @@
+import zlib
+import hashlib
+import numpy as np
+import pandas as pd
+from .profiling import tracer
+
+TEXT_FIELDS = ["title", "summary", "experience", "skills", "education"]
+
+# Mersenne prime: (a * x + b) tetap muat di uint64 untuk x, a, b < 2^31
+_PRIME = (1 << 31) - 1
+
+
+def cv_text(row) -> str:
+    # compact frame: raw experience/education sudah di-drop, pakai versi enriched
+    return " ".join(str(row.get(f) or row.get(f + "_enriched") or "") for f in TEXT_FIELDS)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(" ".join(text.split()).encode()).hexdigest()
+
+
+class MinHashLSH:
+    """
+    MinHash signatures over word shingles, banded LSH for candidate pairs.
+
+    With num_perm=128 and bands=32 (4 rows per band) pairs with Jaccard >= ~0.6
+    almost always share a bucket; candidates are then confirmed against
+    `threshold` using the signature agreement as Jaccard estimate.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        words = text.split()
+        k = self.shingle_size
+        grams = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        return np.fromiter((zlib.crc32(g.encode()) % _PRIME for g in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        x = self.shingles(text)
+        if x.size == 0:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        return ((self.a * x + self.b) % _PRIME).min(axis=1)
+
+    def candidate_pairs(self, signatures: np.ndarray):
+        pairs = set()
+        for band in range(self.bands):
+            buckets = {}
+            block = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for i, key in enumerate(map(bytes, block)):
+                buckets.setdefault(key, []).append(i)
+            for members in buckets.values():
+                for j in members[1:]:
+                    pairs.add((members[0], j))
+        return pairs
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def find_duplicate_clusters(texts, threshold: float = 0.8, lsh: MinHashLSH = None):
+    """
+    Group texts into clusters of exact or near duplicates (Jaccard >= threshold).
+    Returns a list of index lists; singletons are omitted.
+    """
+    n = len(texts)
+    parent = list(range(n))
+
+    def union(i, j):
+        ri, rj = _find(parent, i), _find(parent, j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # 1) exact content hash
+    first = {}
+    for i, t in enumerate(texts):
+        h = content_hash(t)
+        if h in first:
+            union(first[h], i)
+        else:
+            first[h] = i
+
+    # 2) near duplicates: MinHash + LSH, hanya untuk representative per hash
+    lsh = lsh or MinHashLSH()
+    uniq = sorted(first.values())
+    if len(uniq) > 1:
+        sigs = np.stack([lsh.signature(texts[i]) for i in uniq])
+        for a, b in lsh.candidate_pairs(sigs):
+            if np.mean(sigs[a] == sigs[b]) >= threshold:
+                union(uniq[a], uniq[b])
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def deduplicate(df: pd.DataFrame, threshold: float = 0.8):
+    """
+    Keep one representative per duplicate cluster (the longest text, then cv_id).
+
+    Returns (deduplicated df, clusters df with cluster_id / representative /
+    duplicates / size).
+    """
+    empty = pd.DataFrame(columns=["cluster_id", "representative", "duplicates", "size"])
+    if len(df) < 2:
+        return df, empty
+
+    with tracer.stage("dedup", items=len(df)) as span:
+        texts = [cv_text(row) for row in df.to_dict("records")]
+        clusters = find_duplicate_clusters(texts, threshold)
+
+        drop, report = set(), []
+        for cid, members in enumerate(clusters):
+            members = sorted(members, key=lambda i: (-len(texts[i]), df["cv_id"].iloc[i]))
+            rep, dups = members[0], members[1:]
+            drop.update(dups)
+            report.append({
+                "cluster_id": cid,
+                "representative": df["cv_id"].iloc[rep],
+                "duplicates": [df["cv_id"].iloc[i] for i in dups],
+                "size": len(members),
+            })
+
+        span.set(clusters=len(clusters), removed=len(drop))
+
+    if not drop:
+        return df, empty
+
+    keep = [i for i in range(len(df)) if i not in drop]
+    return df.iloc[keep].reset_index(drop=True), pd.DataFrame(report)
@@ -0,0 +1,75 @@
+import numpy as np
+from .profiling import tracer
+
+# (max tokens, batch size): short texts in big batches, long ones in small batches.
+# None = sisa teks sampai max_seq_length model.
+DEFAULT_BUCKETS = ((16, 256), (32, 128), (64, 64), (128, 32), (None, 16))
+
+
+class EmbeddingScheduler:
+    """
+    Encode a pool of texts in length buckets instead of one small call per row.
+
+    Texts are de-duplicated, measured in tokens with the model's tokenizer and
+    grouped so every batch is padded to roughly its own length; each bucket runs
+    with its own batch size. Truncation stays at the encoder's max_seq_length
+    (see load_encoder): the tokenizer already pads to the longest member of a
+    batch, and the encoder may be shared with other jobs, so it is not mutated.
+    Results come back in input order.
+    """
+
+    def __init__(self, model, buckets=DEFAULT_BUCKETS):
+        self.model = model
+        self.buckets = buckets
+        self.stats = {}
+
+    def token_lengths(self, texts) -> np.ndarray:
+        limit = getattr(self.model, "max_seq_length", None)
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            # encoder tanpa tokenizer (mis. stub): kira-kira dari jumlah kata
+            return np.array([min(len(t.split()) + 2, limit or 10**9) for t in texts])
+        kwargs = {"truncation": True, "max_length": limit} if limit else {}
+        ids = tokenizer(list(texts), add_special_tokens=True, **kwargs)["input_ids"]
+        return np.array([len(x) for x in ids])
+
+    def encode(self, texts) -> np.ndarray:
+        texts = list(texts)
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        with tracer.stage("embed.schedule", items=len(texts), unique=len(unique)) as span:
+            lengths = self.token_lengths(unique)
+            order = np.argsort(lengths, kind="stable")
+
+            out = None
+            start, per_bucket, padded = 0, {}, 0
+            for bound, batch_size in self.buckets:
+                end = len(order) if bound is None else int(np.searchsorted(lengths[order], bound, side="right"))
+                idx = order[start:max(start, end)]
+                start = max(start, end)
+                if not len(idx):
+                    continue
+
+                emb = self.model.encode([unique[i] for i in idx], batch_size=batch_size, convert_to_numpy=True)
+                if out is None:
+                    out = np.empty((len(unique), emb.shape[1]), dtype=np.float32)
+                out[idx] = emb
+
+                per_bucket[str(bound)] = len(idx)
+                for b in range(0, len(idx), batch_size):
+                    batch = lengths[idx[b:b + batch_size]]
+                    padded += int(batch.max()) * len(batch)
+
+            self.stats = {
+                "texts": len(texts),
+                "unique": len(unique),
+                "buckets": per_bucket,
+                "tokens": int(lengths.sum()),
+                "padded_tokens_est": padded,
+            }
+            span.set(**{k: v for k, v in self.stats.items() if k != "buckets"})
+
+        pos = {t: i for i, t in enumerate(unique)}
+        return out[[pos[t] for t in texts]]
@@ -0,0 +1,196 @@
+import os
+import queue
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .encoders import EMBEDDING_MODEL, load_encoder
+from .profiling import tracer
+
+
+def _worker(loader, loader_kwargs, tasks, done):
+    # worker tidak ikut tracing: tracemalloc memperlambat import torch, dan stage-nya dicatat di parent
+    tracer.disable()
+    try:
+        encoder = loader(**loader_kwargs)
+    except Exception as e:
+        done.put(("error", None, f"{type(e).__name__}: {e}"))
+        return
+    # dimensi dari satu encode: nama method-nya berbeda antar versi sentence-transformers
+    dim = np.asarray(encoder.encode(["ready"], convert_to_numpy=True)).shape[1]
+    done.put(("ready", dim, getattr(encoder, "max_seq_length", None)))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        call_id, shm_name, shape, start, texts, batch_size, normalize = task
+        try:
+            emb = encoder.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                                 normalize_embeddings=normalize)
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                np.ndarray(shape, dtype=np.float32, buffer=shm.buf)[start:start + len(texts)] = emb
+            finally:
+                shm.close()
+            done.put(("ok", call_id, len(texts)))
+        except Exception as e:
+            done.put(("error", call_id, f"{type(e).__name__}: {e}"))
+
+
+class EncodePool:
+    """
+    SentenceTransformer-compatible encode() spread over worker processes.
+
+    Every worker loads its own encoder with loader(model_name, threads=...,
+    **loader_kwargs) (load_encoder by default) and writes its rows straight into a
+    shared-memory output buffer, so only the texts are pickled. Texts are sorted
+    by length and sent in chunks of `chunk_size`, which keeps padding low and
+    lets fast workers pick up more chunks. Calls are serialized; each one uses
+    every worker.
+
+    Use as a context manager or call close(); workers are spawned, not forked,
+    because torch's thread pools do not survive fork.
+
+    If a worker dies during a call, that call raises RuntimeError and the
+    remaining workers are stopped (a dead worker can leave the queues locked);
+    encode() starts a fresh set of workers when it finds one dead.
+    """
+
+    # interval cek worker yang mati selama menunggu hasil
+    POLL_S = 1.0
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        workers: int = 2,
+        threads: int = None,
+        chunk_size: int = 256,
+        tokenizer=None,
+        loader=load_encoder,
+        **loader_kwargs,
+    ):
+        self.workers = workers
+        self.threads = threads or max(1, (os.cpu_count() or 1) // workers)
+        self.chunk_size = chunk_size
+        # dipakai EmbeddingScheduler untuk menghitung panjang token (opsional)
+        self.tokenizer = tokenizer
+
+        # loader(model_name, threads=..., **loader_kwargs) jalan di tiap worker
+        self._loader = loader
+        self._loader_kwargs = {"model_name": model_name, "threads": self.threads, **loader_kwargs}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._procs = []
+        self._closed = False
+        self._start()
+
+    def _start(self):
+        ctx = mp.get_context("spawn")
+        self._tasks, self._done = ctx.Queue(), ctx.Queue()
+        self._procs = [
+            ctx.Process(target=_worker, args=(self._loader, self._loader_kwargs, self._tasks, self._done),
+                        name=f"encode-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for p in self._procs:
+            p.start()
+
+        ready = [self._get() for _ in self._procs]
+        failed = [detail for status, _, detail in ready if status == "error"]
+        if failed:
+            self._stop()
+            raise RuntimeError(f"encode worker failed to load the model: {failed[0]}")
+        self.dim, self.max_seq_length = ready[0][1], ready[0][2]
+
+    def _get(self):
+        """Next worker message; raises (and stops the pool) when a worker has died."""
+        while True:
+            try:
+                return self._done.get(timeout=self.POLL_S)
+            except queue.Empty:
+                dead = [p for p in self._procs if not p.is_alive()]
+                if dead:
+                    codes = ", ".join(f"{p.name} (exit code {p.exitcode})" for p in dead)
+                    self._stop(timeout=1)
+                    raise RuntimeError(f"encode worker died: {codes}")
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        convert_to_tensor: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        if texts:
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+            ordered = [texts[i] for i in order]
+            with self._lock, tracer.stage("embed.pool", items=len(texts), workers=self.workers):
+                if self._closed:
+                    raise RuntimeError("encode pool is closed")
+                if not all(p.is_alive() for p in self._procs) or not self._procs:
+                    # worker mati (sejak / di panggilan sebelumnya): pool dibangun ulang
+                    self._stop(timeout=1)
+                    self._start()
+                self._calls += 1
+                shm = shared_memory.SharedMemory(create=True, size=out.nbytes)
+                try:
+                    chunks = range(0, len(ordered), self.chunk_size)
+                    for start in chunks:
+                        self._tasks.put((self._calls, shm.name, out.shape, start,
+                                         ordered[start:start + self.chunk_size], batch_size, normalize_embeddings))
+
+                    errors = []
+                    for _ in chunks:
+                        status, _, detail = self._get()
+                        if status == "error":
+                            errors.append(detail)
+                    if errors:
+                        raise RuntimeError(f"encode worker failed: {errors[0]}")
+
+                    out[order] = np.ndarray(out.shape, dtype=np.float32, buffer=shm.buf)
+                finally:
+                    shm.close()
+                    shm.unlink()
+
+        if single:
+            out = out[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(out)
+        return out
+
+    def _stop(self, timeout=10):
+        for p in self._procs:
+            if p.is_alive():
+                self._tasks.put(None)
+        for p in self._procs:
+            p.join(timeout=timeout)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        self._procs = []
+        for q in (self._tasks, self._done):
+            q.cancel_join_thread()
+            q.close()
+
+    def close(self):
+        self._closed = True
+        self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
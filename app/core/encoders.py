@@ -0,0 +1,46 @@
+import os
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# torch: model asli, torch-int8: Linear layers dynamic-quantized ke int8
+ENCODER_BACKENDS = ("torch", "torch-int8")
+
+
+def load_encoder(
+    model_name: str = EMBEDDING_MODEL,
+    backend: str = "torch",
+    threads: int = None,
+    max_seq_length: int = None,
+):
+    """
+    Load a sentence encoder on CPU with the given inference backend.
+
+    All backends return a SentenceTransformer, so CVScorer / CandidateIngestor
+    use them unchanged; encode() already sorts each call's texts by length
+    before batching. threads sets the intra-op thread count (torch.set_num_threads
+    is process-wide); max_seq_length truncates longer inputs.
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}', expected one of {ENCODER_BACKENDS}")
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if threads:
+        torch.set_num_threads(threads)
+    model = SentenceTransformer(model_name, device="cpu")
+    if backend == "torch-int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    if max_seq_length:
+        model.max_seq_length = max_seq_length
+    return model
+
+
+def encoder_options_from_env() -> dict:
+    """ENCODER_BACKEND / ENCODER_THREADS / ENCODER_MAX_SEQ_LENGTH."""
+    return {
+        "backend": os.getenv("ENCODER_BACKEND", "torch"),
+        "threads": int(os.getenv("ENCODER_THREADS") or 0) or None,
+        "max_seq_length": int(os.getenv("ENCODER_MAX_SEQ_LENGTH") or 0) or None,
+    }
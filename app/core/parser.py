@@ -1,8 +1,27 @@
 import fitz
+import os
 import re
+import json
+import uuid
+import hashlib
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from .profiling import tracer
+
+# Dipakai untuk setiap baris setiap CV: compile sekali saja
+_BULLETS = re.compile(r"[\u2022\u25cf\u25cb\u25aa\uf0b7\xb7\*\•]")
+_SPACES = re.compile(r"\s+")
+_COMMAS = re.compile(r"( , \s*)+")
+
+# Compact mode: Arrow-backed strings kalau pyarrow tersedia
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    STRING_DTYPE = "string"
 
 
 class CVPipeline:
@@ -20,8 +39,62 @@ class CVPipeline:
         "education": ["education", "education and training", "academic background", "training"]
     }
 
+    # Built-in header dictionaries per language, merged on top of FEATURE_HEADERS
+    LANGUAGE_HEADERS = {
+        "id": {
+            "title": ["jabatan", "posisi"],
+            "summary": ["ringkasan", "ringkasan profesional", "profil", "profil singkat", "tentang saya"],
+            "experience": [
+                "pengalaman", "pengalaman kerja", "pengalaman profesional",
+                "riwayat pekerjaan", "riwayat kerja"
+            ],
+            "skills": ["keahlian", "keahlian teknis", "keterampilan", "kemampuan"],
+            "education": ["pendidikan", "riwayat pendidikan", "pendidikan dan pelatihan", "pelatihan"]
+        }
+    }
+
+    # Layout mode: header = bold or font >= body size * ratio
+    HEADER_SIZE_RATIO = 1.15
+    BOLD_FLAG = 16
+
     MONTHS_PATTERN = r"(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec)"
 
+    def __init__(
+        self,
+        extraction: str = "text",
+        max_pages: int = None,
+        languages=(),
+        header_aliases: dict = None,
+        compact: bool = False,
+    ):
+        """
+        extraction="text": plain get_text("text") of every page (default).
+        extraction="layout": font size / boldness aware, page by page, stops once
+        every section has been closed or after `max_pages`.
+        languages: keys of LANGUAGE_HEADERS to recognize besides English, e.g. ("id",).
+        languages / header_aliases: extra {feature: [alias, ...]} dictionaries
+        added after FEATURE_HEADERS (earlier entries win on conflicts).
+        compact: return a memory-compact frame, see compact_frame().
+        """
+        if extraction not in ("text", "layout"):
+            raise ValueError(f"Unknown extraction mode: {extraction}")
+        unknown = [lang for lang in languages if lang not in self.LANGUAGE_HEADERS]
+        if unknown:
+            raise ValueError(f"Unknown header language(s) {unknown}, expected any of {tuple(self.LANGUAGE_HEADERS)}")
+        self.extraction = extraction
+        self.languages = tuple(languages)
+        self.max_pages = max_pages
+        self.compact = compact
+
+        dictionaries = [self.FEATURE_HEADERS]
+        dictionaries += [self.LANGUAGE_HEADERS[lang] for lang in languages]
+        if header_aliases:
+            dictionaries.append(header_aliases)
+        self.header_index = self.build_header_index(dictionaries)
+        self.header_digest = hashlib.sha1(
+            json.dumps(sorted(self.header_index.items())).encode()
+        ).hexdigest()[:8]
+
     # =========================
     # CLEANING
     # =========================
@@ -29,11 +102,11 @@ class CVPipeline:
         if not isinstance(text, str):
             return ""
 
-        text = re.sub(r"[\u2022\u25cf\u25cb\u25aa\uf0b7\xb7\*\•]", " , ", text)
+        text = _BULLETS.sub(" , ", text)
         text = text.encode("ascii", errors="ignore").decode()
         text = text.lower().replace("&", " and ")
-        text = re.sub(r"\s+", " ", text)
-        text = re.sub(r"( , \s*)+", ", ", text)
+        text = _SPACES.sub(" ", text)
+        text = _COMMAS.sub(", ", text)
 
         return text.strip().strip(",")
 
@@ -47,12 +120,28 @@ class CVPipeline:
             return False
         return True
 
+    def build_header_index(self, dictionaries) -> dict:
+        """Flatten header dictionaries into {clean alias: feature}; first alias wins."""
+        index = {}
+        for headers in dictionaries:
+            for feature, aliases in headers.items():
+                if feature not in self.FEATURE_HEADERS:
+                    raise ValueError(f"Unknown feature in header dictionary: {feature}")
+                for alias in aliases:
+                    index.setdefault(self.clean_line(alias), feature)
+        return index
+
     def match_header(self, line: str):
-        for feature, headers in self.FEATURE_HEADERS.items():
-            for h in headers:
-                if line == h or line.startswith(h + ":"):
-                    return feature
-        return None
+        # "alias" atau "alias: ..." -> dua lookup dict, berapapun jumlah alias
+        feature = self.header_index.get(line)
+        if feature is None and ":" in line:
+            feature = self.header_index.get(line.partition(":")[0])
+        return feature
+
+    @staticmethod
+    def load_header_aliases(path) -> dict:
+        """Read a {feature: [alias, ...]} JSON file for `header_aliases`."""
+        return json.loads(Path(path).read_text(encoding="utf-8"))
 
     # =========================
     # TITLE FALLBACK
@@ -66,30 +155,41 @@ class CVPipeline:
     # =========================
     # PDF
     # =========================
-    def pdf_to_text(self, pdf_path: Path) -> str:
-        doc = fitz.open(pdf_path)
-        return "\n".join(p.get_text("text") for p in doc)
+    def open_pdf(self, pdf):
+        """Open a PDF from a path or straight from in-memory bytes (no temp file)."""
+        if isinstance(pdf, (str, Path)):
+            return fitz.open(pdf)
+        return fitz.open(stream=pdf, filetype="pdf")
+
+    def pdf_to_text(self, pdf) -> str:
+        with self.open_pdf(pdf) as doc:
+            return "\n".join(p.get_text("text") for p in doc)
 
     # =========================
     # FEATURE EXTRACTION
     # =========================
     def extract_features(self, text: str) -> dict:
-        lines = text.split("\n")
+        def items():
+            for raw in text.split("\n"):
+                line = self.clean_line(raw)
+                if not line:
+                    continue
+                matched = self.match_header(line) if self.is_header_line(line) else None
+                yield line, matched
+
+        return self._assemble(items())
+
+    def _assemble(self, items) -> dict:
+        """Build the feature dict from (clean line, matched header or None) pairs."""
         data = {k: "" for k in self.FEATURE_HEADERS}
         current = "title"
         title_taken = False
 
-        for raw in lines:
-            line = self.clean_line(raw)
-            if not line:
+        for line, matched in items:
+            if matched:
+                current = matched
                 continue
 
-            if self.is_header_line(line):
-                matched = self.match_header(line)
-                if matched:
-                    current = matched
-                    continue
-
             if current == "title" and not title_taken:
                 data["title"] = line
                 title_taken = True
@@ -103,6 +203,78 @@ class CVPipeline:
 
         return {k: v.strip() for k, v in data.items()}
 
+    # =========================
+    # LAYOUT-AWARE EXTRACTION
+    # =========================
+    def iter_layout_lines(self, doc):
+        """
+        Yield (raw text, size, bold, styled) per visual line, one page at a time.
+        `styled` marks lines that look like headers: bold or larger than the page's
+        dominant body size. On pages with a single uniform style every line counts
+        as styled, so plain-text CVs fall back to the text-mode header rules.
+        """
+        n_pages = len(doc) if self.max_pages is None else min(len(doc), self.max_pages)
+
+        for pno in range(n_pages):
+            lines = []
+            chars_by_size = {}
+
+            for block in doc[pno].get_text("dict")["blocks"]:
+                for ln in block.get("lines", []):
+                    spans = [sp for sp in ln["spans"] if sp["text"].strip()]
+                    if not spans:
+                        continue
+                    size = round(max(sp["size"] for sp in spans), 1)
+                    bold = all(sp["flags"] & self.BOLD_FLAG or "bold" in sp["font"].lower() for sp in spans)
+                    lines.append(("".join(sp["text"] for sp in ln["spans"]), size, bold))
+                    for sp in spans:
+                        sz = round(sp["size"], 1)
+                        chars_by_size[sz] = chars_by_size.get(sz, 0) + len(sp["text"])
+
+            if not lines:
+                continue
+
+            body = max(chars_by_size, key=chars_by_size.get)
+            uniform = len({(sz, b) for _, sz, b in lines}) == 1
+            for text, size, bold in lines:
+                yield text, size, bold, uniform or bold or size >= body * self.HEADER_SIZE_RATIO
+
+    def extract_features_layout(self, pdf) -> dict:
+        sections = set(self.FEATURE_HEADERS) - {"title"}
+
+        def items(doc):
+            current = "title"
+            seen, closed = set(), set()
+            header_styles = set()
+
+            for raw, size, bold, styled in self.iter_layout_lines(doc):
+                line = self.clean_line(raw)
+                if not line:
+                    continue
+
+                is_header = styled and self.is_header_line(line)
+                matched = self.match_header(line) if is_header else None
+
+                if matched:
+                    closed.add(current)
+                    seen.add(matched)
+                    header_styles.add((size, bold))
+                    current = matched
+                    yield line, matched
+                    continue
+
+                # Header bergaya sama tapi tidak dikenal (portfolio, appendix, ...)
+                # setelah semua section terlihat: section terakhir ditutup
+                if is_header and seen >= sections and (size, bold) in header_styles:
+                    closed.add(current)
+                if closed >= sections:
+                    return
+
+                yield line, None
+
+        with self.open_pdf(pdf) as doc:
+            return self._assemble(items(doc))
+
     # =========================
     # EXPERIENCE ENRICH
     # =========================
@@ -139,20 +311,24 @@ class CVPipeline:
     def enrich_experience(self, df):
         date_regex = rf"({self.MONTHS_PATTERN}\s+\d{{4}}|\d{{1,2}}/\d{{2,4}}|\b\d{{4}}\b)\s+(?:to|until|-)\s+({self.MONTHS_PATTERN}\s+\d{{4}}|\d{{1,2}}/\d{{2,4}}|\b\d{{4}}\b|current|present|now)"
 
-        def process(row):
-            text = row["experience"]
-            matches = list(re.finditer(date_regex, text, re.IGNORECASE))
+        date_re = re.compile(date_regex, re.IGNORECASE)
+
+        def process(title, text):
+            matches = list(date_re.finditer(text))
             if not matches:
-                return f"[[role: {row['title']}][0 years][content: {text}]]"
+                return f"[[role: {title}][0 years][content: {text}]]"
 
+            # deskripsi sama untuk semua blok: hitung sekali
+            desc = date_re.sub("", text).strip()
             blocks = []
             for m in matches:
                 dur = self.calculate_duration(m.group(0))
-                desc = re.sub(date_regex, "", text, flags=re.IGNORECASE)
-                blocks.append(f"[[role: {row['title']}][{dur} years][content: {desc.strip()}]]")
+                blocks.append(f"[[role: {title}][{dur} years][content: {desc}]]")
             return " ".join(blocks)
 
-        df["experience_enriched"] = df.apply(process, axis=1)
+        df["experience_enriched"] = [
+            process(t, e) for t, e in zip(df["title"], df["experience"])
+        ]
         return df
 
     # =========================
@@ -172,29 +348,151 @@ class CVPipeline:
 
         return f"[[institution: {inst}][cert_count: {certs}][content: {clean}]]"
 
+    # =========================
+    # COMPACT FRAME
+    # =========================
+    RAW_COLUMNS = ["experience", "education", "skills_list"]
+    TEXT_COLUMNS = ["cv_id", "summary", "skills", "experience_enriched", "education_enriched"]
+
+    @staticmethod
+    def split_skills(skills: str) -> list:
+        return [s.strip() for s in str(skills or "").split(",") if s.strip()]
+
+    def compact_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink a parsed frame for large pools: drop raw text that only fed the
+        enrichment (experience, education) and skills_list (derivable from skills
+        via split_skills), categorical titles, Arrow-backed string columns.
+        """
+        df = df.drop(columns=[c for c in self.RAW_COLUMNS if c in df.columns])
+        df["title"] = df["title"].fillna("").astype("category")
+        for col in self.TEXT_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].fillna("").astype(STRING_DTYPE)
+        return df
+
     # =========================
     # PIPELINE
     # =========================
-    def run(self, pdf_folder: str) -> pd.DataFrame:
-        rows = []
+    CACHE_VERSION = 1
 
-        for pdf in Path(pdf_folder).glob("*.pdf"):
-            text = self.pdf_to_text(pdf)
-            feat = self.extract_features(text)
-            feat["cv_id"] = pdf.name
+    def parse_pdf(self, pdf, name: str = None) -> dict:
+        """Parse one CV given as a path or as PDF bytes (then `name` is the cv_id)."""
+        if self.extraction == "layout":
+            with tracer.stage("parse.extract_layout", items=1):
+                feat = self.extract_features_layout(pdf)
+        else:
+            with tracer.stage("parse.pdf_to_text") as span:
+                text = self.pdf_to_text(pdf)
+                span.set(items=1, chars=len(text))
 
+            with tracer.stage("parse.extract_features", items=1):
+                feat = self.extract_features(text)
+
+        feat["cv_id"] = name or Path(pdf).name
+
+        with tracer.stage("parse.clean_line", items=1):
             for k in feat:
                 feat[k] = self.clean_line(feat[k])
 
-            if not feat["title"]:
-                feat["title"] = self.infer_title_from_experience(feat["experience"])
+        if not feat["title"]:
+            feat["title"] = self.infer_title_from_experience(feat["experience"])
+
+        feat["skills_list"] = self.split_skills(feat["skills"])
+        return feat
+
+    def _cache_path(self, data: bytes, cache_dir: Path) -> Path:
+        digest = hashlib.sha1(data).hexdigest()
+        languages = "+".join(self.languages) or "en"
+        mode = f"{self.extraction}-{self.max_pages or 'all'}-{languages}-{self.header_digest}"
+        return cache_dir / f"v{self.CACHE_VERSION}" / mode / f"{digest}.json"
+
+    def parse_pdf_cached(self, pdf, cache_dir=None, name: str = None) -> dict:
+        """parse_pdf with an optional on-disk cache keyed by file content."""
+        if cache_dir is None:
+            return self.parse_pdf(pdf, name)
+
+        name = name or Path(pdf).name
+        data = Path(pdf).read_bytes() if isinstance(pdf, (str, Path)) else pdf
+        path = self._cache_path(data, Path(cache_dir))
+        feat = self._read_cache(path)
+        if feat is None:
+            feat = self.parse_pdf(data, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # tmp unik + os.replace: worker lain (CV duplikat) tidak pernah membaca file setengah jadi
+            tmp = path.with_name(f".{path.stem}.{uuid.uuid4().hex}.tmp")
+            try:
+                tmp.write_text(json.dumps(feat), encoding="utf-8")
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+        # sama seperti parse_pdf (cv_id ikut clean_line), dengan atau tanpa cache
+        feat["cv_id"] = self.clean_line(name)
+        return feat
+
+    @staticmethod
+    def _read_cache(path: Path):
+        """Cached features, or None when the entry is missing or unreadable (treated as a miss)."""
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _parse_item(self, item, cache_dir=None) -> dict:
+        name, pdf = item
+        return self.parse_pdf_cached(pdf, cache_dir, name)
+
+    def run(self, pdf_folder: str, workers: int = 1, cache_dir=None, on_progress=None) -> pd.DataFrame:
+        """
+        on_progress(done, total) is called after every parsed PDF; raising from
+        it (e.g. on cancellation) aborts the run.
+        """
+        pdfs = sorted(Path(pdf_folder).glob("*.pdf"))
+        return self.run_streams([(p.name, p) for p in pdfs], workers, cache_dir, on_progress)
+
+    def run_streams(self, files, workers: int = 1, cache_dir=None, on_progress=None) -> pd.DataFrame:
+        """
+        Same as run() for (name, source) pairs, where source is a path or PDF bytes,
+        e.g. the buffers of uploaded files. `files` may be a generator: parsing
+        starts with the first item instead of waiting for the whole batch.
+        """
+        total = len(files) if hasattr(files, "__len__") else None
+        rows = []
 
-            feat["skills_list"] = [s.strip() for s in feat["skills"].split(",") if s.strip()]
+        def done(feat):
             rows.append(feat)
+            if on_progress:
+                on_progress(len(rows), total or len(rows))
+
+        with tracer.stage("parse.run", workers=workers) as run_span:
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    chunksize = max(1, total // (workers * 4)) if total else 1
+                    for feat in pool.map(partial(self._parse_item, cache_dir=cache_dir), files, chunksize=chunksize):
+                        done(feat)
+            else:
+                for item in files:
+                    done(self._parse_item(item, cache_dir))
+
+            df = self.build_frame(rows)
+            run_span.set(items=len(df))
 
+        return df
+
+    def build_frame(self, rows) -> pd.DataFrame:
+        """Parsed feature dicts -> enriched (and, in compact mode, compacted) DataFrame."""
+        if not rows:
+            # tanpa PDF: frame kosong, pemanggil cukup cek df.empty
+            return pd.DataFrame()
         df = pd.DataFrame(rows)
 
-        df = self.enrich_experience(df)
-        df["education_enriched"] = df["education"].apply(self.enrich_education)
+        with tracer.stage("parse.enrich", items=len(df)):
+            df = self.enrich_experience(df)
+            df["education_enriched"] = df["education"].apply(self.enrich_education)
+
+        if self.compact:
+            with tracer.stage("parse.compact", items=len(df)):
+                df = self.compact_frame(df)
 
         return df
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+import tracemalloc
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Run id per konteks (thread job / sesi UI): job yang berjalan bersamaan tidak saling mencampur trace
+_RUN_ID = contextvars.ContextVar("cv_trace_run_id", default=None)
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self._peak = 0
+        self.tracer._open_span(self)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._t0
+        peak = self.tracer._close_span(self)
+        self.tracer._record({
+            "run_id": self.tracer.run_id,
+            "stage": self.name,
+            "wall_s": round(wall, 6),
+            "peak_mem_mb": round(peak / 2**20, 3),
+            "error": exc_type.__name__ if exc_type else None,
+            **self.fields,
+        })
+        return False
+
+
+class Tracer:
+    """
+    Lightweight per-stage instrumentation.
+
+    Disabled by default; enable with CV_TRACE=1 (optionally CV_TRACE_FILE=path.jsonl)
+    or tracer.enable(). When disabled, stage() returns a shared no-op span.
+
+    Records are tagged with the run id of the current context (new_run() /
+    use_run()), so concurrent analysis jobs each get their own summary().
+    """
+
+    MAX_RUNS = 20
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self._default_run = None
+        self._runs = []
+        self.records = []
+        self._lock = threading.Lock()
+        self._open = set()  # span yang sedang berjalan (semua thread)
+
+        if os.getenv("CV_TRACE", "0").lower() in ("1", "true", "yes"):
+            self.enable(os.getenv("CV_TRACE_FILE") or None)
+
+    def enable(self, path=None, track_memory=True):
+        self.enabled = True
+        self.path = Path(path) if path else None
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.new_run()
+
+    def disable(self):
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @property
+    def run_id(self):
+        return _RUN_ID.get() or self._default_run
+
+    def new_run(self):
+        """Start a run for the current context (thread); records of other runs are kept."""
+        run_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._runs.append(run_id)
+            if len(self._runs) > self.MAX_RUNS:
+                old = self._runs.pop(0)
+                self.records = [r for r in self.records if r["run_id"] != old]
+        if self._default_run is None:
+            self._default_run = run_id
+        _RUN_ID.set(run_id)
+        return run_id
+
+    def use_run(self, run_id):
+        """Tag the current context's records with an existing run id."""
+        _RUN_ID.set(run_id)
+
+    def stage(self, name, **fields):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, fields)
+
+    def _open_span(self, span):
+        # reset_peak() berlaku global: puncak sejauh ini dititipkan dulu ke span yang masih terbuka,
+        # supaya span anak (atau span di thread lain) tidak menghapus puncak parent-nya
+        with self._lock:
+            if tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                for other in self._open:
+                    other._peak = max(other._peak, peak)
+                tracemalloc.reset_peak()
+            self._open.add(span)
+
+    def _close_span(self, span) -> int:
+        """Peak traced memory (bytes) over the span's lifetime, nested spans included."""
+        with self._lock:
+            self._open.discard(span)
+            peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+            return max(span._peak, peak)
+
+    def _record(self, rec):
+        with self._lock:
+            self.records.append(rec)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(rec, default=str) + "\n")
+
+    # -------------------------
+    # Reporting
+    # -------------------------
+    def summary(self, run_id=None):
+        """Aggregate one run's records (default: the current context's run) per stage."""
+        run_id = run_id or self.run_id
+        agg = {}
+        with self._lock:
+            records = [r for r in self.records if r["run_id"] == run_id]
+
+        for r in records:
+            s = agg.setdefault(r["stage"], {
+                "stage": r["stage"], "calls": 0, "wall_s": 0.0, "peak_mem_mb": 0.0
+            })
+            s["calls"] += 1
+            s["wall_s"] += r["wall_s"]
+            s["peak_mem_mb"] = max(s["peak_mem_mb"], r["peak_mem_mb"])
+            for k, v in r.items():
+                if k in ("run_id", "stage", "wall_s", "peak_mem_mb", "error"):
+                    continue
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    s[k] = s.get(k, 0) + v
+
+        return sorted(agg.values(), key=lambda s: s["wall_s"], reverse=True)
+
+
+tracer = Tracer()
+
+
+def llm_usage(output) -> dict:
+    """Extract prompt/completion token counts from a llama.cpp completion."""
+    usage = output.get("usage") or {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+    }
@@ -0,0 +1,94 @@
+import numpy as np
+
+# float32: 4 B/dim (MiniLM 384 dim = 1.5 KB), float16: 2 B/dim, int8: 1 B/dim + 4 B scale per row
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+
+class QuantizedMatrix:
+    """
+    Row-wise scalar-quantized embedding matrix.
+
+    int8 uses a symmetric per-row scale (max |x| / 127), so cosine / inner
+    product rankings survive the rounding; float16 is a plain downcast.
+    """
+
+    def __init__(self, data: np.ndarray, scale: np.ndarray = None, dtype: str = "float32"):
+        self.data = data
+        self.scale = scale
+        self.dtype = dtype
+
+    @classmethod
+    def from_float(cls, emb, dtype: str = "int8") -> "QuantizedMatrix":
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype '{dtype}', expected one of {EMBEDDING_DTYPES}")
+        emb = np.atleast_2d(np.asarray(emb, dtype=np.float32))
+
+        if dtype == "int8":
+            scale = np.abs(emb).max(axis=1, keepdims=True) / 127.0
+            scale[scale == 0] = 1.0
+            data = np.clip(np.rint(emb / scale), -127, 127).astype(np.int8)
+            return cls(data, scale.astype(np.float32), dtype)
+        return cls(emb.astype(dtype), None, dtype)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scale.nbytes if self.scale is not None else 0)
+
+    def dequantize(self, rows=slice(None)) -> np.ndarray:
+        out = self.data[rows].astype(np.float32)
+        if self.scale is not None:
+            out *= self.scale[rows]
+        return out
+
+    def dot(self, q, block: int = 65536) -> np.ndarray:
+        """q (k, dim) float32 -> (k, n) inner products, dequantizing `block` rows at a time."""
+        q = np.atleast_2d(np.asarray(q, dtype=np.float32))
+        out = np.empty((len(q), len(self)), dtype=np.float32)
+        for start in range(0, len(self), block):
+            rows = slice(start, start + block)
+            out[:, rows] = q @ self.dequantize(rows).T
+        return out
+
+
+def quantize_roundtrip(emb, dtype: str = "float32") -> np.ndarray:
+    """What a similarity sees when the embedding is stored as `dtype`."""
+    if dtype == "float32":
+        return emb
+    return QuantizedMatrix.from_float(emb, dtype).dequantize().reshape(np.shape(emb))
+
+
+def ranking_agreement(reference, candidate, k: int = 10) -> dict:
+    """
+    Compare two score vectors over the same items: top-k overlap, Spearman
+    rank correlation and the largest absolute score difference.
+    """
+    ref = np.asarray(reference, dtype=np.float64)
+    cand = np.asarray(candidate, dtype=np.float64)
+    if ref.shape != cand.shape:
+        raise ValueError("score vectors must have the same shape")
+    if ref.size == 0:
+        return {"top_k_overlap": 1.0, "spearman": 1.0, "max_abs_diff": 0.0}
+
+    k = min(k, ref.size)
+    top_ref = set(np.argsort(-ref, kind="stable")[:k])
+    top_cand = set(np.argsort(-cand, kind="stable")[:k])
+
+    def ranks(x):
+        r = np.empty(x.size)
+        r[np.argsort(x, kind="stable")] = np.arange(x.size)
+        return r
+
+    rr, rc = ranks(ref), ranks(cand)
+    spearman = np.corrcoef(rr, rc)[0, 1] if ref.size > 1 else 1.0
+    return {
+        "top_k_overlap": round(len(top_ref & top_cand) / k, 4),
+        "spearman": round(float(spearman), 4),
+        "max_abs_diff": round(float(np.abs(ref - cand).max()), 6),
+    }
@@ -0,0 +1,116 @@
+import os
+import json
+import uuid
+import pickle
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+from .dedup import content_hash, cv_text
+
+# Skor mentah yang hanya bergantung pada CV + job; bobot baru masuk di combine_scores
+COMPONENT_COLUMNS = ["score_skills", "summary_raw", "edu_raw", "exp_raw"]
+NORM_MAP = {
+    "summary_raw": "score_summary_final",
+    "edu_raw": "score_education_final",
+    "exp_raw": "score_experience_final",
+}
+SCORE_COLUMNS = list(NORM_MAP.values()) + ["total_score"]
+
+
+def combine_scores(df: pd.DataFrame, weights: dict, ranges: dict = None) -> pd.DataFrame:
+    """
+    Min-max normalize the raw components and add total_score (in place).
+
+    ranges pins {raw column: (min, max)}, e.g. to normalize a subset against
+    the whole pool. This is the only place weights enter the score.
+    """
+    ranges = ranges or {}
+    for r, f in NORM_MAP.items():
+        mn, mx = ranges.get(r) or (df[r].min(), df[r].max())
+        df[f] = (df[r] - mn) / (mx - mn) if mx != mn else 0.5
+
+    df["total_score"] = (
+        df["score_experience_final"] * weights["experience"] +
+        df["score_skills"] * weights["skills"] +
+        df["score_summary_final"] * weights["summary"] +
+        df["score_education_final"] * weights["education"]
+    )
+    return df
+
+
+def rerank(components: pd.DataFrame, weights: dict, top_n: int = None) -> pd.DataFrame:
+    """
+    New ranking from a scored frame (or stored components) without re-scoring.
+
+    Gives the same order and scores as score_dataframe with these weights;
+    the input frame is not modified.
+    """
+    # hanya kolom angka yang dihitung & diurutkan; kolom teks cukup diambil untuk top N
+    scores = combine_scores(components[COMPONENT_COLUMNS].reset_index(drop=True), weights)
+    order = scores["total_score"].sort_values(ascending=False).index
+    if top_n:
+        order = order[:top_n]
+    df = components.iloc[order].reset_index(drop=True)
+    df[SCORE_COLUMNS] = scores.loc[order, SCORE_COLUMNS].to_numpy()
+    return df
+
+
+def job_hash(job: dict) -> str:
+    """Hash of everything in a CVScorer job except the weights."""
+    fields = {k: v for k, v in job.items() if k != "weights"}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def pool_manifest(df: pd.DataFrame) -> str:
+    """Hash of the CV pool: cv_id plus normalized content of every row, order independent."""
+    lines = sorted(f"{cv_id}\t{content_hash(cv_text(row))}" for cv_id, row in zip(df["cv_id"], df.to_dict("records")))
+    return hashlib.sha1("\n".join(lines).encode()).hexdigest()
+
+
+class ComponentStore:
+    """
+    Scored frames (raw components, no weighted columns) pickled on disk per
+    (pool manifest, job hash). Oldest entries beyond `max_entries` are removed.
+    """
+
+    def __init__(self, root, max_entries: int = 64):
+        self.root = Path(root)
+        self.max_entries = max_entries
+
+    def path(self, manifest: str, job_key: str) -> Path:
+        return self.root / f"{manifest[:20]}-{job_key[:20]}.pkl"
+
+    def load(self, manifest: str, job_key: str):
+        path = self.path(manifest, job_key)
+        try:
+            os.utime(path)  # eviction berdasarkan pemakaian terakhir
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # belum ada, baru saja di-evict job lain, atau rusak: dihitung ulang
+            return None
+
+    def save(self, manifest: str, job_key: str, scored: pd.DataFrame):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(manifest, job_key)
+        # tmp unik: dua job untuk pool + job yang sama boleh menyimpan bersamaan
+        tmp = path.with_name(f".{path.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(scored.drop(columns=SCORE_COLUMNS, errors="ignore"), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        def mtime(p):
+            try:
+                return p.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries = sorted(self.root.glob("*.pkl"), key=mtime, reverse=True)
+        for old in entries[self.max_entries:]:
+            old.unlink(missing_ok=True)
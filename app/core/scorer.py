@@ -1,9 +1,24 @@
 import re
 import ast
+from collections import Counter
 import numpy as np
 import pandas as pd
 import torch
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
+from .profiling import tracer
+from .parser import CVPipeline
+from .quantize import EMBEDDING_DTYPES, quantize_roundtrip
+from .encoders import load_encoder
+from .embed_scheduler import EmbeddingScheduler
+from .rerank import combine_scores
+
+# Kata "fluff" yang dibuang dari kalimat summary sebelum di-embed (satu regex untuk semua)
+SUMMARY_FLUFF = [
+    "professional", "dedicated", "hardworking", "seeking",
+    "opportunity", "proven", "years", "experience"
+]
+_FLUFF = re.compile(r"\b(?:%s)\b" % "|".join(SUMMARY_FLUFF))
+_SPACES = re.compile(r"\s+")
 
 
 class CVScorer:
@@ -16,71 +31,178 @@ class CVScorer:
         weights: dict,
         model_name: str = "all-MiniLM-L6-v2",
         title_sim_threshold: float = 0.6,
+        batch_size: int = 32,
+        model=None,
+        embedding_dtype: str = "float32",
+        backend: str = "torch",
+        scheduled: bool = True,
     ):
         self.job_title = job_title
         self.job_description = job_description
         self.required_skills = required_skills
         self.highlight_keywords = highlight_keywords
+        self._kw_counts = Counter(str(k).lower() for k in highlight_keywords)
+        self._kw_pattern, self._kw_credit = self._keyword_scanner(self._kw_counts)
         self.weights = weights
         self.title_sim_threshold = title_sim_threshold
+        self.batch_size = batch_size
+        if embedding_dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype '{embedding_dtype}', expected one of {EMBEDDING_DTYPES}")
+        self.embedding_dtype = embedding_dtype
 
-        self.model = SentenceTransformer(model_name)
+        # model: any object with a SentenceTransformer-compatible encode()
+        self.model = model if model is not None else load_encoder(model_name, backend=backend)
+        self.encode_stats = {"encode_calls": 0, "encoded_texts": 0, "cache_hits": 0}
+
+        # scheduled: embed semua teks pool sekaligus (per length bucket) sebelum scoring per baris
+        self.scheduler = EmbeddingScheduler(self.model) if scheduled else None
+        self._emb_cache = {}
 
         # Pre-encode target (optimasi)
-        self.job_title_emb = self.model.encode(job_title, convert_to_tensor=True)
-        self.job_desc_emb = self.model.encode(job_description, convert_to_tensor=True)
+        self.job_title_emb = self._encode(job_title)
+        self.job_desc_emb = self._encode(job_description)
+
+    def _encode(self, texts):
+        keys = [texts] if isinstance(texts, str) else texts
+        if self._emb_cache and all(k in self._emb_cache for k in keys):
+            self.encode_stats["cache_hits"] += len(keys)
+            emb = torch.from_numpy(np.stack([self._emb_cache[k] for k in keys]))
+            return emb[0] if isinstance(texts, str) else emb
+
+        self.encode_stats["encode_calls"] += 1
+        self.encode_stats["encoded_texts"] += 1 if isinstance(texts, str) else len(texts)
+        emb = self.model.encode(texts, batch_size=self.batch_size, convert_to_tensor=True)
+        if self.embedding_dtype == "float32":
+            return emb
+        # similarity dihitung dari nilai yang sudah dikuantisasi (float16 / int8)
+        return torch.from_numpy(quantize_roundtrip(emb.cpu().numpy(), self.embedding_dtype))
+
+    def prefetch(self, texts, stage="score.embed"):
+        """Embed texts in length buckets and serve later _encode() calls from the cache."""
+        texts = [t for t in dict.fromkeys(texts) if t not in self._emb_cache]
+        if not texts or self.scheduler is None:
+            return
+
+        before = dict(self.encode_stats)
+        with tracer.stage(stage, items=len(texts)) as span:
+            emb = quantize_roundtrip(self.scheduler.encode(texts), self.embedding_dtype)
+            self._emb_cache.update(zip(texts, emb))
+            self.encode_stats["encode_calls"] += len(self.scheduler.stats["buckets"])
+            self.encode_stats["encoded_texts"] += len(texts)
+            span.set(**{k: self.encode_stats[k] - before[k] for k in before})
+
+    def _stage(self, name, fn, series, pooled=False):
+        """Apply a per-row scorer (or, pooled, a whole-column one) to a column inside a traced stage."""
+        apply = fn if pooled else (lambda col: col.apply(fn))
+        if not tracer.enabled:
+            return apply(series)
+
+        before = dict(self.encode_stats)
+        with tracer.stage(name, items=len(series), encode_batch_size=self.batch_size) as span:
+            out = apply(series)
+            span.set(**{k: self.encode_stats[k] - before[k] for k in before})
+        return out
+
+    # ======================================================
+    # HIGHLIGHT KEYWORDS
+    # ======================================================
+    @staticmethod
+    def _keyword_scanner(keywords):
+        """
+        (pattern, credit) to find every keyword contained in a text in one scan.
+
+        The pattern is a lookahead alternation, longest keyword first, so each
+        position reports the longest keyword starting there, overlaps included.
+        credit maps that keyword to all keywords that are a prefix of it, i.e.
+        that occur at the same position.
+        """
+        unique = sorted((k for k in keywords if k), key=len, reverse=True)
+        if not unique:
+            return None, {}
+        pattern = re.compile("(?=(%s))" % "|".join(map(re.escape, unique)))
+        return pattern, {k: [p for p in unique if k.startswith(p)] for k in unique}
+
+    def _keyword_hits(self, text) -> int:
+        """How many highlight keywords (repeats included) occur in text, case-insensitive."""
+        hits = self._kw_counts.get("", 0)
+        if self._kw_pattern is not None:
+            found = {p for m in self._kw_pattern.finditer(str(text).lower()) for p in self._kw_credit[m.group(1)]}
+            hits += sum(self._kw_counts[k] for k in found)
+        return hits
 
     # ======================================================
     # GATE: TITLE FILTER
     # ======================================================
+    def _gate_text(self, title):
+        """Lowercased title when the gate needs its embedding, else None."""
+        if not title or pd.isna(title):
+            return None
+        t_cv = str(title).lower().strip()
+        t_job = self.job_title.lower().strip()
+        return None if (t_job in t_cv or t_cv in t_job) else t_cv
+
     def filter_by_title(self, df: pd.DataFrame) -> pd.DataFrame:
         def _pass(title):
             if not title or pd.isna(title):
                 return False
-            t_cv = str(title).lower().strip()
-            t_job = self.job_title.lower().strip()
-
-            if t_job in t_cv or t_cv in t_job:
+            t_cv = self._gate_text(title)
+            if t_cv is None:
                 return True
 
-            emb_cv = self.model.encode(t_cv, convert_to_tensor=True)
+            emb_cv = self._encode(t_cv)
             sim = util.pytorch_cos_sim(emb_cv, self.job_title_emb).item()
             return sim >= self.title_sim_threshold
 
-        return df[df["title"].apply(_pass)].copy().reset_index(drop=True)
+        # Gate hanya bergantung pada title: evaluasi sekali per title unik
+        titles = pd.Series(df["title"].unique())
+        self.prefetch([t for t in map(self._gate_text, titles) if t], stage="score.embed_titles")
+        passed = dict(zip(titles, self._stage("score.title_gate", _pass, titles)))
+        mask = df["title"].map(passed).eq(True).to_numpy()
+
+        out = df[mask]  # boolean indexing sudah membuat frame baru
+        out.reset_index(drop=True, inplace=True)
+        return out
 
     # ======================================================
     # SKILLS
     # ======================================================
-    def score_skills(self, cv_skills_raw) -> float:
+    def _skill_match(self, cv_skills_raw):
+        """(cv_low, hard, remain) or None when there is nothing to compare."""
         if not self.required_skills:
-            return 0.0
+            return None
         try:
             cv_skills = ast.literal_eval(cv_skills_raw) if isinstance(cv_skills_raw, str) else cv_skills_raw
         except:
             cv_skills = []
 
         if not cv_skills:
-            return 0.0
+            return None
 
         cv_low = [str(s).lower().strip() for s in cv_skills]
         req_low = [s.lower().strip() for s in self.required_skills]
-        n = len(req_low)
 
         hard = []
         remain = []
 
         for s in req_low:
             (hard if s in cv_low else remain).append(s)
+        return cv_low, hard, remain
 
+    def score_skills(self, cv_skills_raw) -> float:
+        match = self._skill_match(cv_skills_raw)
+        if match is None:
+            return 0.0
+
+        cv_low, hard, remain = match
+        n = len(self.required_skills)
         score = len(hard)
 
         if remain:
-            emb_cv = self.model.encode(cv_low, convert_to_tensor=True)
+            emb_cv = self._encode(cv_low)
             cv_used = set()
         
             for s in remain:
-                emb_s = self.model.encode(s, convert_to_tensor=True)
+                emb_s = self._encode(s)
                 sims = util.pytorch_cos_sim(emb_s, emb_cv)[0]
         
                 for idx in cv_used:
@@ -98,43 +220,73 @@ class CVScorer:
     # ======================================================
     # SUMMARY
     # ======================================================
-    def score_summary_raw(self, summary) -> float:
+    @staticmethod
+    def _summary_chunks(summary) -> list:
+        """Cleaned summary sentences that get embedded."""
         if not summary or pd.isna(summary):
-            return 0.0
-
-        def clean(text):
-            fluff = [
-                "professional", "dedicated", "hardworking", "seeking",
-                "opportunity", "proven", "years", "experience"
-            ]
-            text = str(text).lower()
-            for w in fluff:
-                text = re.sub(rf"\b{w}\b", "", text)
-            return re.sub(r"\s+", " ", text).strip()
+            return []
 
         chunks = [c.strip() for c in str(summary).replace("\n", ".").split(".") if len(c.strip()) > 10]
+        return [_SPACES.sub(" ", _FLUFF.sub("", c.lower())).strip() for c in chunks]
+
+    def score_summary_raw(self, summary) -> float:
+        chunks = self._summary_chunks(summary)
         if not chunks:
             return 0.0
 
-        emb_chunks = self.model.encode([clean(c) for c in chunks], convert_to_tensor=True)
+        emb_chunks = self._encode(chunks)
         sims = util.pytorch_cos_sim(emb_chunks, self.job_desc_emb).flatten().tolist()
         score = max(sims) if sims else 0.0
 
-        bonus = sum(0.5 for kw in self.highlight_keywords if kw.lower() in summary.lower())
-        return score + bonus
+        return score + 0.5 * self._keyword_hits(summary)
+
+    def score_summaries(self, summaries) -> np.ndarray:
+        """
+        score_summary_raw for a whole column: the distinct chunks of all CVs are
+        embedded in one _encode call (served from the prefetch cache when
+        scheduled) and each CV's best similarity is a segment max over one
+        similarity vector.
+        """
+        summaries = list(summaries)
+        per_cv = [self._summary_chunks(s) for s in summaries]
+        counts = np.fromiter(map(len, per_cv), dtype=np.int64, count=len(per_cv))
+        out = np.zeros(len(per_cv))
+        has = np.flatnonzero(counts)
+        if not len(has):
+            return out
+
+        flat = [c for chunks in per_cv for c in chunks]
+        unique = dict.fromkeys(flat)
+        sims = util.pytorch_cos_sim(self._encode(list(unique)), self.job_desc_emb).flatten().cpu().numpy()
+        index = dict(zip(unique, range(len(unique))))
+        sims = sims[np.fromiter((index[c] for c in flat), dtype=np.int64, count=len(flat))]
+
+        # CV tanpa chunk tidak punya segmen (dan tidak dapat bonus, sama seperti score_summary_raw)
+        starts = np.cumsum(counts) - counts
+        out[has] = np.maximum.reduceat(sims, starts[has]).astype(np.float64)
+        out[has] += [0.5 * self._keyword_hits(summaries[i]) for i in has]
+        return out
 
     # ======================================================
     # EDUCATION
     # ======================================================
-    def score_education_raw(self, edu) -> float:
+    @staticmethod
+    def _education_parts(edu):
+        """(cert_count, content) or None."""
         if not edu or pd.isna(edu):
-            return 0.0
-
+            return None
         try:
             cert = int(re.search(r"cert_count:\s*(\d+)", edu).group(1))
             content = re.search(r"content:\s*(.*?)\]\]", edu).group(1)
         except:
+            return None
+        return cert, content
+
+    def score_education_raw(self, edu) -> float:
+        parts = self._education_parts(edu)
+        if parts is None:
             return 0.0
+        cert, content = parts
 
         degree_weights = {
             "phd": 2.0, "doctorate": 2.0,
@@ -149,7 +301,7 @@ class CVScorer:
             if d in content.lower():
                 weight = max(weight, w)
 
-        emb = self.model.encode(content, convert_to_tensor=True)
+        emb = self._encode(content)
         sim = max(0, util.pytorch_cos_sim(emb, self.job_desc_emb).item())
 
         return (sim * weight) + (cert * 0.1)
@@ -157,17 +309,14 @@ class CVScorer:
     # ======================================================
     # EXPERIENCE
     # ======================================================
-    def score_experience_raw(self, exp) -> float:
+    @staticmethod
+    def _experience_blocks(exp) -> list:
+        """[(role, years, content, chunks)] for every enriched experience block."""
         if not exp or pd.isna(exp):
-            return 0.0
-
-        blocks = re.findall(r"\[\[(.*?)\]\]", exp, re.DOTALL)
-        if not blocks:
-            return 0.0
+            return []
 
-        total = 0.0
-
-        for blk in blocks:
+        out = []
+        for blk in re.findall(r"\[\[(.*?)\]\]", exp, re.DOTALL):
             parts = blk.split("][")
             if len(parts) < 3:
                 continue
@@ -175,55 +324,99 @@ class CVScorer:
             role = parts[0].replace("role:", "").strip()
             years = float(re.findall(r"[\d.]+", parts[1])[0]) if re.findall(r"[\d.]+", parts[1]) else 1.0
             content = parts[2].replace("content:", "").strip()
+            chunks = [c for c in content.split(".") if len(c.strip()) > 15]
+            out.append((role, years, content, chunks))
+        return out
+
+    def score_experience_raw(self, exp) -> float:
+        blocks = self._experience_blocks(exp)
+        if not blocks:
+            return 0.0
+
+        total = 0.0
 
+        for role, years, content, chunks in blocks:
             duration = np.log1p(years) + 1
             role_sim = util.pytorch_cos_sim(
-                self.model.encode(role, convert_to_tensor=True),
+                self._encode(role),
                 self.job_title_emb
             ).item()
 
-            chunks = [c for c in content.split(".") if len(c.strip()) > 15]
             content_score = 0.0
             if chunks:
-                embs = self.model.encode(chunks, convert_to_tensor=True)
+                embs = self._encode(chunks)
                 sims = sorted(util.pytorch_cos_sim(embs, self.job_desc_emb).flatten().tolist(), reverse=True)
                 content_score = max(0, sims[0]) + sum(s * 0.2 for s in sims[1:] if s > 0.5)
 
-            kw_bonus = sum(0.2 for kw in self.highlight_keywords if kw.lower() in content.lower())
+            kw_bonus = self._experience_keyword_bonus(content)
             relevance = (max(0, role_sim) * 5) + (content_score * 3) + kw_bonus
 
             total += relevance * duration
 
         return round(total, 4)
 
+    def _experience_keyword_bonus(self, content) -> float:
+        return 0.2 * self._keyword_hits(content)
+
     # ======================================================
     # PIPELINE UTAMA
     # ======================================================
-    def score_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    SCORE_STAGES = [
+        "score.title_gate", "score.embed", "score.skills", "score.summary", "score.education", "score.experience"
+    ]
+
+    def pool_texts(self, skills, summaries, educations, experiences) -> list:
+        """Every text the per-row scorers will embed, in the same form they pass to _encode()."""
+        texts = []
+        for raw in skills:
+            match = self._skill_match(raw)
+            if match and match[2]:
+                texts += match[0] + match[2]
+        for summary in summaries:
+            texts += self._summary_chunks(summary)
+        for edu in educations:
+            parts = self._education_parts(edu)
+            if parts:
+                texts.append(parts[1])
+        for exp in experiences:
+            for role, _, _, chunks in self._experience_blocks(exp):
+                texts.append(role)
+                texts += chunks
+        return texts
+
+    def score_dataframe(self, df: pd.DataFrame, on_progress=None) -> pd.DataFrame:
+        """on_progress(stage, index, total) is called before each scoring stage."""
+        def progress(stage):
+            if on_progress:
+                on_progress(stage, self.SCORE_STAGES.index(stage), len(self.SCORE_STAGES))
+
+        progress("score.title_gate")
         df = self.filter_by_title(df)
         if df.empty:
+            self._emb_cache.clear()
             return df
 
-        df["score_skills"] = df["skills_list"].apply(self.score_skills)
-        df["summary_raw"] = df["summary"].apply(self.score_summary_raw)
-        df["edu_raw"] = df["education_enriched"].apply(self.score_education_raw)
-        df["exp_raw"] = df["experience_enriched"].apply(self.score_experience_raw)
-
-        norm_map = {
-            "summary_raw": "score_summary_final",
-            "edu_raw": "score_education_final",
-            "exp_raw": "score_experience_final",
-        }
-
-        for r, f in norm_map.items():
-            mn, mx = df[r].min(), df[r].max()
-            df[f] = (df[r] - mn) / (mx - mn) if mx != mn else 0.5
-
-        df["total_score"] = (
-            df["score_experience_final"] * self.weights["experience"] +
-            df["score_skills"] * self.weights["skills"] +
-            df["score_summary_final"] * self.weights["summary"] +
-            df["score_education_final"] * self.weights["education"]
-        )
-
+        # compact frame tidak menyimpan skills_list
+        skills = df["skills_list"] if "skills_list" in df.columns else df["skills"].map(CVPipeline.split_skills)
+
+        progress("score.embed")
+        if self.scheduler is not None:
+            self.prefetch(self.pool_texts(
+                skills, df["summary"], df["education_enriched"], df["experience_enriched"]
+            ))
+
+        progress("score.skills")
+        df["score_skills"] = self._stage("score.skills", self.score_skills, skills)
+        progress("score.summary")
+        df["summary_raw"] = self._stage("score.summary", self.score_summaries, df["summary"], pooled=True)
+        progress("score.education")
+        df["edu_raw"] = self._stage("score.education", self.score_education_raw, df["education_enriched"])
+        progress("score.experience")
+        df["exp_raw"] = self._stage("score.experience", self.score_experience_raw, df["experience_enriched"])
+        self._emb_cache.clear()
+
+        df = self._combine(df)
         return df.sort_values("total_score", ascending=False).reset_index(drop=True)
+
+    def _combine(self, df):
+        return combine_scores(df, self.weights)
@@ -0,0 +1,305 @@
+import os
+import time
+import socket
+import threading
+import multiprocessing as mp
+from collections import deque
+from pathlib import Path
+from multiprocessing.connection import Listener, Client, wait
+
+import pandas as pd
+
+from .profiling import tracer
+from .encoders import load_encoder
+from .rerank import NORM_MAP, combine_scores
+
+# Kolom yang dinormalisasi min-max: statistiknya digabung dari semua shard
+RANGE_COLUMNS = list(NORM_MAP)
+
+
+def shard_stats(df: pd.DataFrame) -> dict:
+    """Row count and {raw column: (min, max)} of one scored shard."""
+    if df.empty:
+        return {"rows": 0}
+    return {"rows": len(df), **{c: (float(df[c].min()), float(df[c].max())) for c in RANGE_COLUMNS}}
+
+
+def merge_stats(stats) -> dict:
+    """Global {raw column: (min, max)} from per-shard stats, i.e. what one process would have seen."""
+    filled = [s for s in stats if s["rows"]]
+    return {c: (min(s[c][0] for s in filled), max(s[c][1] for s in filled)) for c in RANGE_COLUMNS}
+
+
+def _read(items) -> list:
+    # shard dikirim sebagai bytes: worker di host lain tidak punya path yang sama
+    return [(name, Path(pdf).read_bytes() if isinstance(pdf, (str, Path)) else pdf) for name, pdf in items]
+
+
+# ======================================================
+# WORKER
+# ======================================================
+def serve(address, authkey: bytes, loader=load_encoder, **loader_kwargs):
+    """
+    Shard worker: connect to a ShardCoordinator at `address` and serve until
+    it closes the connection.
+
+    "score" parses a shard (CVPipeline.run_streams, optional per-shard dedup),
+    scores it with CVScorer and keeps the frame; only its normalization stats
+    and duplicate clusters are sent back. "rank" normalizes the kept shards with the global ranges
+    and returns their top K rows.
+    """
+    from .parser import CVPipeline
+    from .dedup import deduplicate
+    from .scorer import CVScorer
+
+    encoder = loader(**loader_kwargs)
+    frames = {}
+
+    with Client(address, authkey=authkey) as conn:
+        conn.send(("hello", socket.gethostname(), os.getpid()))
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
+            if msg[0] == "close":
+                break
+
+            try:
+                if msg[0] == "score":
+                    _, shard_id, items, job, parser_options, run_options, dedup_threshold = msg
+                    clusters = None
+                    with tracer.stage("shard.score", items=len(items), shard=shard_id):
+                        df = CVPipeline(**parser_options).run_streams(items, **run_options)
+                        if dedup_threshold is not None and len(df) > 1:
+                            df, clusters = deduplicate(df, dedup_threshold)
+                        if not df.empty:
+                            df = CVScorer(model=encoder, **job).score_dataframe(df)
+                    frames[shard_id] = df
+                    conn.send(("scored", shard_id, shard_stats(df), clusters))
+
+                elif msg[0] == "rank":
+                    _, shard_ids, ranges, weights, k = msg
+                    # frame tidak dibutuhkan lagi setelah di-rank
+                    parts = [f for f in (frames.pop(s) for s in shard_ids) if not f.empty]
+                    top = None
+                    if parts:
+                        df = combine_scores(pd.concat(parts, ignore_index=True), weights, ranges)
+                        top = df.sort_values("total_score", ascending=False).head(k or len(df))
+                    conn.send(("ranked", shard_ids, top))
+            except Exception as e:
+                conn.send(("error", msg[1], f"{type(e).__name__}: {e}"))
+
+
+def _local_worker(address, authkey, loader, loader_kwargs):
+    # sama seperti encode_pool: tracing dicatat di coordinator
+    tracer.disable()
+    serve(address, authkey, loader, **loader_kwargs)
+
+
+def start_local_workers(n: int, address, authkey: bytes, loader=load_encoder, **loader_kwargs) -> list:
+    """Spawn `n` worker processes on this machine that connect to the coordinator."""
+    ctx = mp.get_context("spawn")
+    # bukan daemon: worker boleh membuka process pool sendiri (--workers); worker
+    # berhenti sendiri saat koneksi ke coordinator ditutup
+    procs = [
+        ctx.Process(target=_local_worker, args=(address, authkey, loader, loader_kwargs),
+                    name=f"shard-worker-{i}")
+        for i in range(n)
+    ]
+    for p in procs:
+        p.start()
+    return procs
+
+
+# ======================================================
+# COORDINATOR
+# ======================================================
+class ShardCoordinator:
+    """
+    Partition a CV pool into shards and score them on connected workers.
+
+    Workers (serve() / start_local_workers, or app/shard_worker.py on another
+    host) connect over multiprocessing.connection with a shared authkey. Each
+    shard is parsed and scored on one worker; the coordinator merges the
+    per-shard min/max into global normalization ranges and asks every worker
+    for its top K under those ranges, so the merged top K equals a
+    single-process run (duplicates are only detected within a shard; the
+    clusters found are collected in `duplicates`).
+
+    A shard whose worker disconnects or fails is re-queued, up to
+    `max_attempts` tries; shards already scored on a lost worker are scored
+    again elsewhere.
+    """
+
+    def __init__(self, address=("127.0.0.1", 0), authkey: bytes = None, max_attempts: int = 3,
+                 connect_timeout: float = 300.0):
+        self.authkey = authkey or os.urandom(16)
+        self.max_attempts = max_attempts
+        self.connect_timeout = connect_timeout
+        self.listener = Listener(address, authkey=self.authkey)
+        self.workers = {}       # conn -> (host, pid)
+        self.stats = {}
+        self.duplicates = pd.DataFrame()
+        self._new = deque()
+        self._closed = False
+        threading.Thread(target=self._accept, name="shard-accept", daemon=True).start()
+
+    @property
+    def address(self):
+        return self.listener.address
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+                _, host, pid = conn.recv()
+            except mp.AuthenticationError:
+                continue
+            except (OSError, EOFError):
+                if self._closed:
+                    return
+                continue
+            self._new.append((conn, (host, pid)))
+
+    def _take_new(self):
+        while self._new:
+            conn, who = self._new.popleft()
+            self.workers[conn] = who
+
+    def _wait_for_worker(self):
+        deadline = time.monotonic() + self.connect_timeout
+        while not self.workers and time.monotonic() < deadline:
+            time.sleep(0.05)
+            self._take_new()
+        if not self.workers:
+            raise RuntimeError(f"no shard worker connected within {self.connect_timeout:.0f}s")
+
+    def run(self, items, job: dict, top_k: int = None, shard_size: int = 100, parser_options: dict = None,
+            dedup_threshold: float = 0.8, run_options: dict = None) -> pd.DataFrame:
+        """
+        items: [(name, path or bytes)]; job: CVScorer keyword arguments.
+        parser_options / run_options are passed to CVPipeline and its
+        run_streams (workers, cache_dir) on the worker. dedup_threshold=None
+        scores every CV. Returns the global top_k (all rows when None) with the
+        same columns and order as CVScorer.score_dataframe.
+        """
+        items = list(items)
+        shards = {i: items[s:s + shard_size] for i, s in enumerate(range(0, len(items), shard_size))}
+        pending = deque(shards)
+        attempts = dict.fromkeys(shards, 0)
+        owner, stats, clusters, ranked, parts = {}, {}, {}, set(), []
+        busy, ranking = {}, {}  # conn -> shard id / [shard ids]
+        self.stats = {"shards": len(shards), "retries": 0, "lost_workers": 0, "per_worker": {}}
+
+        def retry(shard_ids, reason):
+            for s in shard_ids:
+                attempts[s] += 1
+                if attempts[s] >= self.max_attempts:
+                    raise RuntimeError(f"shard {s} failed {attempts[s]} time(s): {reason}")
+                owner.pop(s, None)
+                stats.pop(s, None)
+                clusters.pop(s, None)
+                pending.append(s)
+                self.stats["retries"] += 1
+
+        def lost(conn, reason):
+            self.workers.pop(conn, None)
+            self.stats["lost_workers"] += 1
+            gone = [busy.pop(conn)] if conn in busy else []
+            gone += ranking.pop(conn, [])
+            gone += [s for s, c in owner.items() if c is conn and s not in ranked and s not in gone]
+            conn.close()
+            retry(gone, reason)
+
+        with tracer.stage("shard.run", items=len(items), shards=len(shards)) as span:
+            while len(ranked) < len(shards):
+                self._take_new()
+                if not self.workers:
+                    self._wait_for_worker()
+
+                # 1) score: shard berikutnya ke worker yang idle
+                for conn in list(self.workers):
+                    if not pending:
+                        break
+                    if conn in busy or conn in ranking:
+                        continue
+                    s = pending.popleft()
+                    try:
+                        conn.send(("score", s, _read(shards[s]), job, parser_options or {}, run_options or {},
+                                   dedup_threshold))
+                        busy[conn] = s
+                    except OSError as e:
+                        pending.appendleft(s)
+                        lost(conn, f"send failed: {e}")
+
+                # 2) rank: setelah semua shard punya statistik, dengan range global
+                if not pending and not busy:
+                    ranges = merge_stats(stats.values()) if any(v["rows"] for v in stats.values()) else {}
+                    for conn in list(self.workers):
+                        todo = [s for s, c in owner.items() if c is conn and s not in ranked]
+                        if todo and conn not in ranking:
+                            try:
+                                conn.send(("rank", todo, ranges, job["weights"], top_k))
+                                ranking[conn] = todo
+                            except OSError as e:
+                                lost(conn, f"send failed: {e}")
+
+                for conn in wait(list(busy) + list(ranking), timeout=0.1):
+                    try:
+                        msg = conn.recv()
+                    except (EOFError, OSError) as e:
+                        lost(conn, f"worker disconnected: {type(e).__name__}")
+                        continue
+
+                    kind = msg[0]
+                    who = "%s:%s" % self.workers[conn]
+                    if kind == "scored":
+                        _, s, shard, found = msg
+                        busy.pop(conn)
+                        owner[s], stats[s] = conn, shard
+                        if found is not None and not found.empty:
+                            clusters[s] = found
+                        self.stats["per_worker"][who] = self.stats["per_worker"].get(who, 0) + len(shards[s])
+                    elif kind == "ranked":
+                        _, done, top = msg
+                        ranking.pop(conn)
+                        ranked.update(done)
+                        if top is not None:
+                            parts.append(top)
+                    else:
+                        _, failed, reason = msg
+                        busy.pop(conn, None)
+                        retry(ranking.pop(conn, None) or [failed], reason)
+
+            span.set(retries=self.stats["retries"], lost_workers=self.stats["lost_workers"])
+
+        # cluster_id per shard dimulai dari 0: beri nomor ulang untuk laporan gabungan
+        if clusters:
+            merged = pd.concat([clusters[s] for s in sorted(clusters)], ignore_index=True)
+            self.duplicates = merged.assign(cluster_id=range(len(merged)))
+        else:
+            self.duplicates = pd.DataFrame()
+
+        if not parts:
+            return pd.DataFrame()
+        merged = pd.concat(parts, ignore_index=True)
+        merged = merged.sort_values("total_score", ascending=False).reset_index(drop=True)
+        return merged.head(top_k) if top_k else merged
+
+    def close(self):
+        self._closed = True
+        for conn in list(self.workers):
+            try:
+                conn.send(("close",))
+            except OSError:
+                pass
+            conn.close()
+        self.workers = {}
+        self.listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
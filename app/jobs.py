@@ -0,0 +1,219 @@
+import json
+import time
+import uuid
+import pickle
+import shutil
+import tempfile
+import threading
+import traceback
+from pathlib import Path
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, owner, fn, args, kwargs, root: Path):
+        self.id = job_id
+        self.owner = owner
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.dir = root / job_id
+        self.status = QUEUED
+        self.stage = ""
+        self.progress = 0.0
+        self.message = ""
+        self.error = None
+        self.created = time.time()
+        self.updated = self.created
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def state(self) -> dict:
+        return {
+            "id": self.id, "owner": self.owner, "status": self.status,
+            "stage": self.stage, "progress": round(self.progress, 4),
+            "message": self.message, "error": self.error,
+            "created": self.created, "updated": self.updated,
+        }
+
+    def _save_state(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        (self.dir / "state.json").write_text(json.dumps(self.state()))
+
+
+class JobContext:
+    """Handle passed to a running task for progress, cancellation and partial results."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    @property
+    def cancelled(self) -> bool:
+        return self.job.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled(self.job.id)
+
+    def progress(self, stage: str, fraction: float, message: str = ""):
+        """Report progress; also the point where cancellation takes effect."""
+        self.check_cancelled()
+        job = self.job
+        with job._lock:
+            job.stage = stage
+            job.progress = max(0.0, min(1.0, fraction))
+            job.message = message
+            job.updated = time.time()
+            job._save_state()
+
+    def publish(self, key: str, value):
+        """Persist a partial result so pollers can render it before the job ends."""
+        job = self.job
+        job.dir.mkdir(parents=True, exist_ok=True)
+        tmp = job.dir / f".{key}.pkl.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(job.dir / f"{key}.pkl")
+        with job._lock:
+            job.updated = time.time()
+
+
+class JobManager:
+    """
+    Local analysis queue: a fixed pool of worker threads, no external broker.
+
+    Workers pick the oldest queued job of the owner with the fewest running jobs,
+    so one recruiter submitting many analyses does not starve the others.
+    Results are pickled under `jobs_dir/<job_id>/` and read back by pollers.
+    """
+
+    def __init__(self, max_workers: int = 2, jobs_dir=None, max_age_s: float = 24 * 3600):
+        self.max_workers = max_workers
+        self.root = Path(jobs_dir) if jobs_dir else Path(tempfile.gettempdir()) / "cv_insight_jobs"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_age_s = max_age_s
+
+        self._jobs = {}
+        self._queue = []
+        self._running = {}      # owner -> running job count
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"cv-job-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def submit(self, fn, *args, owner: str = "default", **kwargs) -> str:
+        """Queue fn(ctx, *args, **kwargs); returns the job id."""
+        self._evict_old()
+        job = Job(uuid.uuid4().hex[:12], owner, fn, args, kwargs, self.root)
+        job._save_state()
+        with self._cond:
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._cond.notify()
+        return job.id
+
+    def cancel(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job.cancel_event.set()
+        with self._cond:
+            if job in self._queue:
+                self._queue.remove(job)
+                self._finish(job, CANCELLED)
+
+    def status(self, job_id: str) -> dict:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            state = job.state()
+        else:
+            path = self.root / job_id / "state.json"
+            if not path.exists():
+                return None
+            state = json.loads(path.read_text())
+        if state["status"] == QUEUED:
+            state["queue_position"] = self._queue_position(job_id)
+        return state
+
+    def result(self, job_id: str, key: str, default=None):
+        path = self.root / job_id / f"{key}.pkl"
+        if not path.exists():
+            return default
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def jobs(self, owner: str = None) -> list:
+        return [j.state() for j in self._jobs.values() if owner is None or j.owner == owner]
+
+    # -------------------------
+    # Scheduling
+    # -------------------------
+    def _queue_position(self, job_id):
+        with self._cond:
+            for i, j in enumerate(self._queue):
+                if j.id == job_id:
+                    return i
+        return None
+
+    def _next_job(self):
+        # fairness: owner with the fewest running jobs first, FIFO within ties
+        return min(
+            self._queue,
+            key=lambda j: (self._running.get(j.owner, 0), j.created),
+        )
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                job = self._next_job()
+                self._queue.remove(job)
+                self._running[job.owner] = self._running.get(job.owner, 0) + 1
+                job.status = RUNNING
+                job._save_state()
+
+            try:
+                job.fn(JobContext(job), *job.args, **job.kwargs)
+                status = CANCELLED if job.cancel_event.is_set() else DONE
+            except JobCancelled:
+                status = CANCELLED
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.message = traceback.format_exc(limit=5)
+                status = FAILED
+
+            with self._cond:
+                self._running[job.owner] -= 1
+                self._finish(job, status)
+
+    def _finish(self, job, status):
+        with job._lock:
+            job.status = status
+            if status == DONE:
+                job.progress = 1.0
+            job.updated = time.time()
+            job._save_state()
+        # argumen (DataFrame, bytes) tidak perlu disimpan setelah selesai
+        job.fn = job.args = job.kwargs = None
+
+    def _evict_old(self):
+        cutoff = time.time() - self.max_age_s
+        with self._cond:
+            old = [j for j in self._jobs.values() if j.status in FINISHED and j.updated < cutoff]
+            for j in old:
+                del self._jobs[j.id]
+        for j in old:
+            shutil.rmtree(j.dir, ignore_errors=True)
@@ -0,0 +1,181 @@
+import os
+import threading
+from functools import lru_cache
+from dotenv import load_dotenv
+from core.profiling import tracer, llm_usage
+
+# ====== CONFIG ======
+load_dotenv()
+
+MAX_CHARS_PER_FIELD = 1000
+MAX_TOKENS = 192
+
+def truncate_text(text, max_chars=MAX_CHARS_PER_FIELD):
+    if not text:
+        return ""
+    return text[:max_chars]
+
+# Satu Llama context tidak thread-safe: semua pemanggilan lewat lock ini
+llm_lock = threading.Lock()
+# Load pertama diserialkan: dua job yang bersamaan tidak membangun dua model multi-GB
+_load_lock = threading.RLock()
+
+# ====== SPECULATIVE DECODING ======
+# off: biasa, prompt-lookup: draft dari n-gram prompt (summary banyak mengutip CV),
+# model: draft GGUF kecil dengan tokenizer yang sama (DRAFT_MODEL_PATH)
+DRAFT_MODES = ("off", "prompt-lookup", "model")
+
+
+def draft_options_from_env() -> dict:
+    """DRAFT_MODE / DRAFT_MODEL_PATH / DRAFT_NUM_PRED_TOKENS."""
+    return {
+        "draft_mode": os.getenv("DRAFT_MODE", "off"),
+        "draft_model_path": os.getenv("DRAFT_MODEL_PATH") or None,
+        "draft_num_pred_tokens": int(os.getenv("DRAFT_NUM_PRED_TOKENS") or 0) or None,
+    }
+
+
+class GGUFDraftModel:
+    """
+    llama_cpp draft model (LlamaDraftModel interface) backed by a small GGUF:
+    greedily proposes `num_pred_tokens` tokens that the main model verifies in
+    one batch. Both models must share a vocabulary, e.g. a 0.5B and a 7B of
+    the same family.
+    """
+
+    def __init__(self, path, num_pred_tokens: int = 8, n_ctx: int = 4096, n_threads=None):
+        from llama_cpp import Llama
+
+        self.num_pred_tokens = num_pred_tokens
+        self.model = Llama(model_path=path, n_ctx=n_ctx, n_threads=n_threads, n_gpu_layers=0, verbose=False)
+
+    def __call__(self, input_ids, /, **kwargs):
+        import numpy as np
+
+        draft = []
+        # generate() memakai ulang KV cache untuk prefix yang sama dengan panggilan sebelumnya
+        for token in self.model.generate(input_ids.tolist(), top_k=1, temp=0.0, reset=True):
+            if token == self.model.token_eos():
+                break
+            draft.append(token)
+            if len(draft) >= self.num_pred_tokens:
+                break
+        return np.array(draft, dtype=np.intc)
+
+
+def make_draft_model(mode="off", model_path=None, num_pred_tokens=None, n_ctx=4096, n_threads=None):
+    """Draft model for Llama(draft_model=...), or None when mode is "off"."""
+    if mode not in DRAFT_MODES:
+        raise ValueError(f"Unknown draft mode '{mode}', expected one of {DRAFT_MODES}")
+    if mode == "off":
+        return None
+    if mode == "prompt-lookup":
+        from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+        return LlamaPromptLookupDecoding(num_pred_tokens=num_pred_tokens or 10)
+    if not model_path:
+        raise ValueError("DRAFT_MODE=model needs DRAFT_MODEL_PATH")
+    return GGUFDraftModel(model_path, num_pred_tokens or 8, n_ctx, n_threads)
+
+
+def new_llama(path, n_ctx=4096, n_threads=None, draft_mode="off", draft_model_path=None, draft_num_pred_tokens=None):
+    """Load a GGUF model on CPU, optionally with a speculative draft model (not cached, see load_llama)."""
+    # llama_cpp hanya diimport saat model benar-benar dipakai
+    from llama_cpp import Llama
+
+    if n_threads is None:
+        n_threads = max(1, os.cpu_count() // 2)
+
+    with tracer.stage("llm.load", items=1, draft=draft_mode):
+        return Llama(
+            model_path=path,
+            n_ctx=n_ctx,
+            n_threads=n_threads,
+            n_gpu_layers=0,
+            draft_model=make_draft_model(draft_mode, draft_model_path, draft_num_pred_tokens, n_ctx, n_threads),
+            verbose=False
+        )
+
+
+@lru_cache(maxsize=None)
+def _cached_llama(*args):
+    return new_llama(*args)
+
+
+def load_llama(path, n_ctx=4096, n_threads=None, draft_mode="off", draft_model_path=None, draft_num_pred_tokens=None):
+    """
+    Load a GGUF model once per process. Summaries and RAG share the same
+    weights instead of each keeping a multi-GB copy in RAM. The draft_*
+    options (see draft_options_from_env) enable speculative decoding.
+    """
+    with _load_lock:
+        return _cached_llama(path, n_ctx, n_threads, draft_mode, draft_model_path, draft_num_pred_tokens)
+
+class GGUFModel:
+    def __init__(self, path=None, n_ctx=4096, n_threads=None):
+        if path is None:
+            path = os.getenv("MODEL_PATH")
+
+        self.model = load_llama(path, n_ctx, n_threads, **draft_options_from_env())
+
+        self.system_prompt = (
+            "You are an HR assistant. "
+            "Analyze CVs quietly and respectfully. "
+            "Do not make up information."
+        )
+        self.history = []
+
+    def generate(self, user_text: str) -> str:
+
+        self.history = [f"User: {user_text}"]
+
+        prompt = self.system_prompt + "\n"
+        prompt += "\n".join(self.history)
+        prompt += "\nAssistant:"
+
+        with llm_lock, tracer.stage("llm.generate", items=1) as span:
+            output = self.model(
+                prompt,
+                max_tokens=MAX_TOKENS,
+                temperature=0.7,
+                stop=["User:"]
+            )
+            span.set(**llm_usage(output))
+
+        answer = output["choices"][0]["text"].strip()
+        return answer
+
+# ====== LAZY MODEL ======
+_llm_model = None
+
+def get_llm_model() -> GGUFModel:
+    """Load the GGUF model on first use instead of at import time."""
+    global _llm_model
+    with _load_lock:
+        if _llm_model is None:
+            _llm_model = GGUFModel()
+    return _llm_model
+
+# ====== PROMPT ======
+def build_summary_prompt(row, job_title, job_description, required_skills) -> str:
+    content = f"""
+Title: {truncate_text(row.get('title',''))}
+Summary: {truncate_text(row.get('summary',''))}
+Experience: {truncate_text(row.get('experience_enriched',''))}
+Skills: {truncate_text(row.get('skills',''))}
+Education: {truncate_text(row.get('education_enriched',''))}
+"""
+    return f"""
+Job Title: {job_title}
+Job Description: {job_description}
+Required Skills: {', '.join(required_skills)}
+
+CV Information:
+{content}
+
+Provide a short summary in English and highlight the strengths and weaknesses of the candidate in relation to the job.
+Do NOT include any preamble like "Here is the summary" or "Oke, summary". 
+Output only the requested sections in this format:
+\nSummary:
+\nStrengths:
+\nWeaknesses:
+"""
@@ -1,3 +1,15 @@
-from .rag_qa import RAGModel
-from .ingest import CandidateIngestor
-from .retriever import Retriever    
+# Lazy exports: faiss / llama_cpp are only imported when the class is used
+def __getattr__(name):
+    if name == "RAGModel":
+        from .rag_qa import RAGModel
+        return RAGModel
+    if name == "CandidateIngestor":
+        from .ingest import CandidateIngestor
+        return CandidateIngestor
+    if name == "Retriever":
+        from .retriever import Retriever
+        return Retriever
+    if name == "AnswerCache":
+        from .answer_cache import AnswerCache
+        return AnswerCache
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,137 @@
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+from core.profiling import tracer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL,
+    context_key TEXT NOT NULL,
+    question TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    answer TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS answers_key ON answers (job_key, context_key);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+COUNTERS = ("hits", "misses", "stores", "evictions")
+
+
+def context_key(chunks) -> str:
+    """
+    Key of a retrieved context: the set of chunk ids plus the scores the
+    prompt shows for them (re-weighting changes those, and so the answer).
+    """
+    parts = sorted(
+        f"{c['id']}:{c['meta'].get('overall_score')}:{c['meta'].get('section_score')}" for c in chunks
+    )
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+class AnswerCache:
+    """
+    Semantic cache of RAG answers in SQLite.
+
+    An entry is found by (job key, retrieved context key) and then by cosine
+    similarity of the question embedding: a rephrased question with the same
+    retrieved chunks above `threshold` reuses the stored answer. Entries
+    expire after `ttl_s`; beyond `max_entries` the least recently used are
+    evicted. Hit / miss counters are kept in the database.
+    """
+
+    def __init__(self, path, threshold: float = 0.95, ttl_s: float = 7 * 24 * 3600, max_entries: int = 2000):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # dipakai dari beberapa thread Streamlit: satu koneksi di belakang lock
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def _unit(emb) -> np.ndarray:
+        emb = np.asarray(emb, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm else emb
+
+    def _count(self, name, n=1):
+        self._db.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, n),
+        )
+
+    def lookup(self, job_key: str, ctx_key: str, question_emb):
+        """Cached answer for a near-identical question over the same context, else None."""
+        q = self._unit(question_emb)
+        with self._lock, self._db, tracer.stage("rag.answer_cache.lookup", items=1) as span:
+            rows = self._db.execute(
+                "SELECT id, embedding, answer FROM answers WHERE job_key = ? AND context_key = ? AND created >= ?",
+                (job_key, ctx_key, time.time() - self.ttl_s),
+            ).fetchall()
+
+            best = None
+            if rows:
+                sims = np.frombuffer(b"".join(r[1] for r in rows), dtype=np.float32).reshape(len(rows), -1) @ q
+                i = int(np.argmax(sims))
+                if sims[i] >= self.threshold:
+                    best = (rows[i][0], rows[i][2])
+
+            span.set(candidates=len(rows), hit=best is not None)
+            if best is None:
+                self._count("misses")
+                return None
+            self._db.execute(
+                "UPDATE answers SET hits = hits + 1, last_used = ? WHERE id = ?", (time.time(), best[0])
+            )
+            self._count("hits")
+            return best[1]
+
+    def store(self, job_key: str, ctx_key: str, question: str, question_emb, answer: str):
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO answers (job_key, context_key, question, embedding, answer, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_key, ctx_key, question, self._unit(question_emb).tobytes(), answer, now, now),
+            )
+            self._count("stores")
+
+            expired = self._db.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl_s,)).rowcount
+            overflow = self._db.execute(
+                "DELETE FROM answers WHERE id IN (SELECT id FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            if expired + overflow:
+                self._count("evictions", expired + overflow)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._db.execute("SELECT name, value FROM counters").fetchall())
+            entries = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        out = {name: counters.get(name, 0) for name in COUNTERS}
+        lookups = out["hits"] + out["misses"]
+        out["entries"] = entries
+        out["hit_rate"] = round(out["hits"] / lookups, 4) if lookups else 0.0
+        return out
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM answers")
+            self._db.execute("DELETE FROM counters")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,161 @@
+import re
+from core.dedup import content_hash
+
+# Batas kalimat; bullet sudah jadi ", " oleh CVPipeline.clean_line
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+_CLAUSE = re.compile(r",\s+")
+_WORD = re.compile(r"\w+")
+
+CHUNKERS = ("token", "char")
+
+
+class CharChunker:
+    """The original chunking: fixed character windows with overlap, skills in blocks of 8, no de-duplication."""
+
+    # section yang dipotong dengan split(); section lain jadi satu chunk utuh
+    SECTIONS = ("experience",)
+
+    def __init__(self, max_chars: int = 600, overlap: int = 100, skills_per_chunk: int = 8):
+        self.max_chars = max_chars
+        self.overlap = overlap
+        self.skills_per_chunk = skills_per_chunk
+
+    def split(self, text) -> list:
+        text = str(text or "").strip()
+        if len(text) <= self.max_chars:
+            return [text] if text else []
+        step = self.max_chars - self.overlap
+        return [text[i:i + self.max_chars] for i in range(0, len(text), step)]
+
+    def skill_blocks(self, skills) -> list:
+        n = self.skills_per_chunk
+        return [", ".join(skills[i:i + n]) for i in range(0, len(skills), n)]
+
+    def dedupe(self, chunks) -> list:
+        return chunks
+
+
+class TokenChunker:
+    """
+    Chunks on sentence and bullet boundaries, sized in encoder tokens.
+
+    Text is split into sentences; a sentence longer than `max_tokens` is
+    split on ", " (bullets and clauses) and, as a last resort, into word
+    windows. Consecutive pieces are then packed into chunks of at most
+    `max_tokens` tokens, so no chunk is cut mid-word or truncated by the
+    encoder. dedupe() drops chunks of one CV that repeat an earlier chunk
+    (word 3-shingle Jaccard >= `dedup_threshold`).
+    """
+
+    SECTIONS = ("summary", "experience")
+
+    def __init__(self, encoder=None, max_tokens: int = 64, skill_tokens: int = 32, dedup_threshold: float = 0.85):
+        # encoder: SentenceTransformer-compatible; tokenizer + max_seq_length dipakai bila ada
+        self.tokenizer = getattr(encoder, "tokenizer", None)
+        limit = getattr(encoder, "max_seq_length", None)
+        # 2 token untuk [CLS] / [SEP]
+        self.max_tokens = min(max_tokens, limit - 2) if limit else max_tokens
+        # daftar skill panjang melemahkan embedding: blok skill lebih kecil
+        self.skill_tokens = min(skill_tokens, self.max_tokens)
+        self.dedup_threshold = dedup_threshold
+
+    def count_tokens(self, texts) -> list:
+        if not texts:
+            return []
+        if self.tokenizer is None:
+            return [len(t.split()) for t in texts]
+        return [len(ids) for ids in self.tokenizer(list(texts), add_special_tokens=False)["input_ids"]]
+
+    def _pieces(self, text) -> list:
+        """
+        (text, tokens, separator) for sentences, with over-long ones broken on
+        clauses, then on words; separator joins the piece to the one before it
+        (", " between clauses of one sentence, so bullets stay separated).
+        """
+        sentences = [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+        out = []
+        for sentence, n in zip(sentences, self.count_tokens(sentences)):
+            if n <= self.max_tokens:
+                out.append((sentence, n, " "))
+                continue
+            clauses = [c.strip() for c in _CLAUSE.split(sentence) if c.strip()]
+            for i, (clause, m) in enumerate(zip(clauses, self.count_tokens(clauses))):
+                sep = ", " if i else " "
+                if m <= self.max_tokens:
+                    out.append((clause, m, sep))
+                else:
+                    windows = self._word_windows(clause)
+                    out += [(w, k, sep if j == 0 else " ") for j, (w, k) in enumerate(windows)]
+        return out
+
+    def _word_windows(self, text) -> list:
+        words, out, start = text.split(), [], 0
+        while start < len(words):
+            # perkiraan awal dari rasio token/kata, lalu dikecilkan sampai muat
+            end = len(words)
+            while True:
+                piece = " ".join(words[start:end])
+                n = self.count_tokens([piece])[0]
+                if n <= self.max_tokens or end - start == 1:
+                    break
+                end = start + max(1, int((end - start) * self.max_tokens / n))
+            out.append((piece, n))
+            start = end
+        return out
+
+    @staticmethod
+    def _pack(pieces, limit, sep=" ") -> list:
+        """
+        Greedily join consecutive (text, tokens[, separator]) pieces into chunks
+        of at most `limit` tokens; pieces without their own separator use `sep`.
+        """
+        chunks, current, size = [], "", 0
+        for piece in pieces:
+            text, n = piece[0], piece[1]
+            # +1: pemisah di antara potongan kira-kira satu token
+            if current and size + n + 1 > limit:
+                chunks.append(current)
+                current, size = "", 0
+            if current:
+                current += (piece[2] if len(piece) > 2 else sep) + text
+                size += n + 1
+            else:
+                current, size = text, n
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def split(self, text) -> list:
+        text = str(text or "").strip()
+        return self._pack(self._pieces(text), self.max_tokens) if text else []
+
+    def skill_blocks(self, skills) -> list:
+        return self._pack(zip(skills, self.count_tokens(skills)), self.skill_tokens, sep=", ")
+
+    @staticmethod
+    def _shingles(text) -> set:
+        words = _WORD.findall(text.lower())
+        if len(words) < 3:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+    def dedupe(self, chunks) -> list:
+        """Chunks ({text, meta}) of one CV without exact or near duplicates; the first occurrence is kept."""
+        kept, hashes, shingles = [], set(), []
+        for chunk in chunks:
+            h = content_hash(chunk["text"])
+            if h in hashes:
+                continue
+            s = self._shingles(chunk["text"])
+            if any(len(s & t) / len(s | t) >= self.dedup_threshold for t in shingles):
+                continue
+            kept.append(chunk)
+            hashes.add(h)
+            shingles.append(s)
+        return kept
+
+
+def make_chunker(kind: str = "token", encoder=None, **kwargs):
+    if kind not in CHUNKERS:
+        raise ValueError(f"Unknown chunker '{kind}', expected one of {CHUNKERS}")
+    return TokenChunker(encoder, **kwargs) if kind == "token" else CharChunker(**kwargs)
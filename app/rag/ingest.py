@@ -1,36 +1,45 @@
 import re
-import uuid
+import hashlib
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from core.profiling import tracer
+from core.parser import CVPipeline
+from core.encoders import EMBEDDING_MODEL, load_encoder
+from .chunker import make_chunker
 
-EMBEDDING_MODEL = "all-MiniLM-L6-v2"
-
-MAX_EXP_CHARS = 600
-EXP_OVERLAP = 100
+# flat: exact float32, sq8 / fp16: FAISS scalar quantizer (1 / 2 B per dim),
+# pq: product quantizer (1 B per 8 dims)
+INDEX_TYPES = ("flat", "sq8", "fp16", "pq")
+PQ_SUBVECTOR_DIM = 8
+PQ_MIN_TRAIN = 39 * 16  # minimal 4-bit codebook
 
 
 class CandidateIngestor:
-    def __init__(self, embedding_model=EMBEDDING_MODEL):
-        self.embedder = SentenceTransformer(embedding_model)
+    def __init__(self, embedding_model=EMBEDDING_MODEL, index_type="flat", backend="torch", chunker="token"):
+        # Accepts a model name or an already-loaded encoder
+        if isinstance(embedding_model, str):
+            embedding_model = load_encoder(embedding_model, backend=backend)
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+        self.embedder = embedding_model
+        # "token" (kalimat/bullet, ukuran dalam token encoder, dedup per CV), "char" (window 600 karakter),
+        # atau objek chunker sendiri
+        self.chunker = make_chunker(chunker, embedding_model) if isinstance(chunker, str) else chunker
+        self.index_type = index_type
         self.chunks = []        # [{text, meta}]
-        self.embeddings = None
 
     # -------------------------
     # Utils
     # -------------------------
-    def _char_chunk(self, text, max_len, overlap):
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + max_len
-            chunks.append(text[start:end])
-            start += max_len - overlap
-        return chunks
+    @staticmethod
+    def chunk_id(text, meta) -> str:
+        """Deterministic id: the same CV section text gets the same id in every build."""
+        key = "\x1f".join(str(meta.get(k, "")) for k in ("cv_id", "section", "exp_index", "sub_chunk"))
+        return hashlib.sha1(f"{key}\x1f{text}".encode()).hexdigest()[:16]
 
     def _new_chunk(self, text, meta):
         self.chunks.append({
-            "id": str(uuid.uuid4()),
+            "id": self.chunk_id(text.strip(), meta),
             "text": text.strip(),
             "meta": meta
         })
@@ -77,23 +86,28 @@ class CandidateIngestor:
     def ingest_summary(self, row):
         if not row.summary:
             return
-        self._new_chunk(
-            text=row.summary,
-            meta={
-                "cv_id": row.cv_id,
-                "section": "summary",
-                "section_score": row.score_summary_final,
-                "overall_score": row.total_score
-            }
-        )
+        meta = {
+            "cv_id": row.cv_id,
+            "section": "summary",
+            "section_score": row.score_summary_final,
+            "overall_score": row.total_score
+        }
+        if "summary" not in self.chunker.SECTIONS:
+            self._new_chunk(text=row.summary, meta=meta)
+            return
+
+        sub_chunks = self.chunker.split(row.summary)
+        for j, sub in enumerate(sub_chunks):
+            self._new_chunk(sub, meta | {"sub_chunk": j} if len(sub_chunks) > 1 else meta)
 
     def ingest_skills(self, row):
-        skills = row.skills_list
+        skills = getattr(row, "skills_list", None)
+        if skills is None:
+            skills = CVPipeline.split_skills(row.skills)
         if not skills:
             return
 
-        for i in range(0, len(skills), 8):
-            skill_block = ", ".join(skills[i:i + 8])
+        for skill_block in self.chunker.skill_blocks(skills):
             self._new_chunk(
                 text=skill_block,
                 meta={
@@ -122,15 +136,12 @@ class CandidateIngestor:
                 "exp_index": idx
             }
 
-            content = exp["content"]
+            sub_chunks = self.chunker.split(exp["content"])
 
             # Kalau pendek → 1 chunk
-            if len(content) <= MAX_EXP_CHARS:
-                self._new_chunk(content, base_meta)
+            if len(sub_chunks) == 1:
+                self._new_chunk(sub_chunks[0], base_meta)
             else:
-                sub_chunks = self._char_chunk(
-                    content, MAX_EXP_CHARS, EXP_OVERLAP
-                )
                 for j, sub in enumerate(sub_chunks):
                     meta = base_meta | {
                         "sub_chunk": j
@@ -154,23 +165,51 @@ class CandidateIngestor:
     # Main API
     # -------------------------
     def ingest_dataframe(self, df):
-        for row in df.itertuples():
-            self.ingest_title(row)
-            self.ingest_summary(row)
-            self.ingest_skills(row)
-            self.ingest_experience(row)
-            self.ingest_education(row)
-
-    def build_faiss_index(self):
+        with tracer.stage("rag.chunk", items=len(df)) as span:
+            dropped = 0
+            for row in df.itertuples():
+                start = len(self.chunks)
+                self.ingest_title(row)
+                self.ingest_summary(row)
+                self.ingest_skills(row)
+                self.ingest_experience(row)
+                self.ingest_education(row)
+
+                # blok experience sering berisi deskripsi yang sama: buang duplikat sebelum embedding
+                kept = self.chunker.dedupe(self.chunks[start:])
+                dropped += len(self.chunks) - start - len(kept)
+                self.chunks[start:] = kept
+            span.set(chunks=len(self.chunks), dropped=dropped)
+
+    def build_faiss_index(self, batch_size=32):
         texts = [c["text"] for c in self.chunks]
-        self.embeddings = self.embedder.encode(
-            texts,
-            convert_to_numpy=True,
-            normalize_embeddings=True
-        )
 
-        dim = self.embeddings.shape[1]
-        index = faiss.IndexFlatIP(dim)
-        index.add(self.embeddings)
+        with tracer.stage("rag.build_faiss_index", items=len(texts), encode_batch_size=batch_size):
+            emb = self.embedder.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ).astype(np.float32, copy=False)
+
+            index = self._make_index(emb)
+            index.add(emb)
+
+        return index
 
+    def _make_index(self, emb):
+        dim = emb.shape[1]
+        if self.index_type == "sq8":
+            index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        elif self.index_type == "fp16":
+            index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT)
+        elif self.index_type == "pq" and dim % PQ_SUBVECTOR_DIM == 0 and len(emb) >= PQ_MIN_TRAIN:
+            # k-means per subvector butuh ~39 titik per centroid: kecilkan codebook untuk pool kecil
+            nbits = min(8, int(np.log2(len(emb) / 39)))
+            index = faiss.IndexPQ(dim, dim // PQ_SUBVECTOR_DIM, nbits, faiss.METRIC_INNER_PRODUCT)
+        else:
+            # flat, atau pq yang terlalu kecil untuk dilatih
+            return faiss.IndexFlatIP(dim)
+
+        index.train(emb)
         return index
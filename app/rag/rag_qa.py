@@ -1,18 +1,10 @@
-from llama_cpp import Llama
+from core.profiling import tracer, llm_usage
+from llm import load_llama, llm_lock, draft_options_from_env
 
 class RAGModel:
     def __init__(self, model_path, n_ctx=4096, n_threads=None):
-        import os
-        if n_threads is None:
-            n_threads = max(1, os.cpu_count() // 2)
-
-        self.model = Llama(
-            model_path=model_path,
-            n_ctx=n_ctx,
-            n_threads=n_threads,
-            n_gpu_layers=0,
-            verbose=False
-        )
+        self.model_path = model_path
+        self.model = load_llama(model_path, n_ctx, n_threads, **draft_options_from_env())
 
     def build_context(self, chunks):
         by_cv = {}
@@ -73,5 +65,8 @@ class RAGModel:
 
 
 
-        output = self.model(prompt, max_tokens=max_tokens, temperature=0)
+        with llm_lock, tracer.stage("rag.answer", items=1, context_chunks=len(chunks)) as span:
+            output = self.model(prompt, max_tokens=max_tokens, temperature=0)
+            span.set(**llm_usage(output))
+
         return output["choices"][0]["text"].strip()
@@ -1,5 +1,8 @@
 import faiss
 import numpy as np
+from core.profiling import tracer
+
+
 class Retriever:
     def __init__(self, index, chunks, embedder, top_k=5):
         self.index = index
@@ -7,25 +10,33 @@ class Retriever:
         self.embedder = embedder
         self.top_k = top_k
 
-    def query(self, query_text):
-        q_emb = self.embedder.encode([query_text], convert_to_numpy=True)
+    def encode_query(self, query_text):
+        return self.embedder.encode([query_text], convert_to_numpy=True)
+
+    def query(self, query_text, q_emb=None):
+        """Top chunks, one per CV. q_emb: the already encoded query (see encode_query)."""
+        with tracer.stage("rag.retrieve", items=1) as span:
+            if q_emb is None:
+                q_emb = self.encode_query(query_text)
+
+            # ambil lebih banyak dulu
+            _, idxs = self.index.search(q_emb, self.top_k * 3)
 
-        # ambil lebih banyak dulu
-        _, idxs = self.index.search(q_emb, self.top_k * 3)
+            seen_cv = set()
+            results = []
 
-        seen_cv = set()
-        results = []
+            for i in idxs[0]:
+                chunk = self.chunks[i]
+                cv_id = chunk["meta"]["cv_id"]
 
-        for i in idxs[0]:
-            chunk = self.chunks[i]
-            cv_id = chunk["meta"]["cv_id"]
+                if cv_id not in seen_cv:
+                    results.append(chunk)
+                    seen_cv.add(cv_id)
 
-            if cv_id not in seen_cv:
-                results.append(chunk)
-                seen_cv.add(cv_id)
+                if len(results) >= self.top_k:
+                    break
 
-            if len(results) >= self.top_k:
-                break
+            span.set(chunks=len(results))
 
         return results
 
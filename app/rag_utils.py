@@ -1,13 +1,21 @@
-from rag.ingest import CandidateIngestor
-from rag.retriever import Retriever
-from rag.rag_qa import RAGModel
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-def build_rag(df_top, top_n):
-    ingestor = CandidateIngestor()
+def build_rag(df_top, top_n, embedder=None, rag_model=None):
+    # Import di dalam fungsi: faiss / llama_cpp tidak ikut dimuat saat UI start
+    from rag.ingest import CandidateIngestor
+    from rag.retriever import Retriever
+
+    options = {
+        "index_type": os.getenv("RAG_INDEX", "flat"),
+        "backend": os.getenv("ENCODER_BACKEND", "torch"),
+        "chunker": os.getenv("RAG_CHUNKER", "token"),
+    }
+    if embedder is not None:
+        options["embedding_model"] = embedder
+    ingestor = CandidateIngestor(**options)
     ingestor.ingest_dataframe(df_top)
 
     index = ingestor.build_faiss_index()
@@ -19,9 +27,39 @@ def build_rag(df_top, top_n):
         top_k=top_n
     )
 
-    rag_model = RAGModel(
-        model_path=os.getenv("MODEL_PATH")
-    )
+    if rag_model is None:
+        from rag.rag_qa import RAGModel
+        rag_model = RAGModel(
+            model_path=os.getenv("MODEL_PATH")
+        )
 
     return ingestor, retriever, rag_model
 
+def answer_question(question, retriever, rag_model, job_title, job_description, required_skills, cache=None):
+    """
+    Retrieve + answer, served from the semantic AnswerCache when the same
+    (or a near-identical) question was asked over the same retrieved chunks.
+    """
+    if cache is None:
+        return rag_model.answer(question, retriever.query(question), job_title, job_description, required_skills)
+
+    from core.rerank import job_hash
+    from rag.answer_cache import context_key
+
+    q_emb = retriever.encode_query(question)
+    chunks = retriever.query(question, q_emb=q_emb)
+
+    # jawaban juga bergantung pada model LLM yang dipakai
+    job_key = job_hash({
+        "job_title": job_title,
+        "job_description": job_description,
+        "required_skills": required_skills,
+        "llm": getattr(rag_model, "model_path", None),
+    })
+    ctx_key = context_key(chunks)
+
+    answer = cache.lookup(job_key, ctx_key, q_emb)
+    if answer is None:
+        answer = rag_model.answer(question, chunks, job_title, job_description, required_skills)
+        cache.store(job_key, ctx_key, question, q_emb, answer)
+    return answer
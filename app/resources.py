@@ -0,0 +1,62 @@
+import os
+import streamlit as st
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# ======================================================
+# Model berat dimuat saat pertama dipakai, lalu di-share
+# antar rerun dan antar session lewat st.cache_resource
+# ======================================================
+@st.cache_resource(show_spinner="Loading embedding model...")
+def get_encoder(model_name: str = EMBEDDING_MODEL):
+    from core.encoders import load_encoder, encoder_options_from_env
+
+    workers = int(os.getenv("ENCODE_WORKERS") or 1)
+    if workers > 1:
+        # scoring, index build dan query berbagi satu pool proses encoder
+        from core.encode_pool import EncodePool
+        return EncodePool(model_name, workers=workers, **encoder_options_from_env())
+    return load_encoder(model_name, **encoder_options_from_env())
+
+@st.cache_resource(show_spinner="Loading local LLM...")
+def get_rag_model():
+    from rag.rag_qa import RAGModel
+    return RAGModel(model_path=os.getenv("MODEL_PATH"))
+
+@st.cache_resource
+def get_job_manager():
+    from jobs import JobManager
+    return JobManager(
+        max_workers=int(os.getenv("ANALYSIS_WORKERS", "2")),
+        jobs_dir=os.getenv("JOBS_DIR") or None
+    )
+
+@st.cache_resource
+def get_component_store():
+    import tempfile
+    from pathlib import Path
+    from core.rerank import ComponentStore
+
+    # skor mentah tergantung encoder: satu folder per model + backend
+    root = Path(os.getenv("COMPONENTS_DIR") or Path(tempfile.gettempdir()) / "cv_insight_components")
+    backend = os.getenv("ENCODER_BACKEND", "torch")
+    return ComponentStore(root / f"{EMBEDDING_MODEL}-{backend}")
+
+@st.cache_resource
+def get_answer_cache():
+    import tempfile
+    from pathlib import Path
+    from rag.answer_cache import AnswerCache
+
+    if os.getenv("RAG_ANSWER_CACHE", "1") == "0":
+        return None
+    path = os.getenv("RAG_ANSWER_CACHE_PATH") or Path(tempfile.gettempdir()) / "cv_insight_answers.sqlite"
+    return AnswerCache(
+        path,
+        threshold=float(os.getenv("RAG_ANSWER_CACHE_THRESHOLD") or 0.95),
+        ttl_s=float(os.getenv("RAG_ANSWER_CACHE_TTL_HOURS") or 7 * 24) * 3600,
+        max_entries=int(os.getenv("RAG_ANSWER_CACHE_MAX_ENTRIES") or 2000),
+    )
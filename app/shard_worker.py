@@ -0,0 +1,40 @@
+"""
+Shard worker for `cli.py --listen`: connects to the coordinator, then parses and
+scores the shards it is sent until the coordinator closes the connection.
+
+    SHARD_AUTHKEY=secret python app/shard_worker.py --connect coordinator-host:6000 --threads 4
+
+Start one per CPU socket / machine; the coordinator retries shards of a worker that dies.
+"""
+import os
+import sys
+import argparse
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="cv-insight-worker",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("--connect", required=True, help="HOST:PORT of the coordinator (cli.py --listen)")
+    ap.add_argument("--model", default="all-MiniLM-L6-v2", help="sentence-transformers model name")
+    ap.add_argument("--backend", choices=["torch", "torch-int8"], default="torch")
+    ap.add_argument("--threads", type=int, default=None, help="encoder intra-op threads")
+    ap.add_argument("--max-seq-length", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    authkey = os.getenv("SHARD_AUTHKEY", "").encode()
+    if not authkey:
+        raise SystemExit("SHARD_AUTHKEY is not set (must match the coordinator)")
+    host, _, port = args.connect.rpartition(":")
+
+    from core.shards import serve
+
+    serve((host or "127.0.0.1", int(port)), authkey, model_name=args.model, backend=args.backend,
+          threads=args.threads, max_seq_length=args.max_seq_length)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,19 @@
 import sys
+import uuid
 from pathlib import Path
 from datetime import datetime
 import streamlit as st
 import pandas as pd
 import tempfile
-from core.parser import CVPipeline
-from core.scorer import CVScorer
-from components import sidebar_inputs, preview_uploaded, show_results, radar_charts, bar_chart
-from ai_summary import generate_summaries, display_summaries
-from rag_utils import build_rag
+from components import (
+    sidebar_inputs, preview_uploaded, show_results, radar_charts, bar_chart, trace_panel, duplicates_panel
+)
+from ai_summary import display_summaries
+from analysis import run_analysis, rerank_top
+from core.profiling import tracer
+from jobs import QUEUED, RUNNING, DONE, FAILED, CANCELLED
+from rag_utils import build_rag, answer_question
+from resources import get_encoder, get_rag_model, get_job_manager, get_component_store, get_answer_cache
 
 st.set_page_config(
     page_title="CV Insight AI",
@@ -52,6 +57,11 @@ st.markdown(footer, unsafe_allow_html=True)
 # ===== INPUT MODE SELECTION =====
 st.sidebar.subheader("CV Input Mode")
 mode = st.sidebar.radio("Choose mode:", ["Upload PDFs", "Select Folder"])
+# Header section berbahasa Inggris selalu dikenali; bahasa lain opsional
+languages = st.sidebar.multiselect(
+    "CV header languages (besides English):", ["id"], default=["id"],
+    format_func={"id": "Indonesian"}.get
+)
 
 st.sidebar.header("Controls")
 if st.sidebar.button("Reset Session"):
@@ -59,82 +69,144 @@ if st.sidebar.button("Reset Session"):
         del st.session_state[key]
     st.rerun()  # reload page
 
-pdf_folder = None
+pdf_source = None
 uploaded_files = []
 
 if mode == "Upload PDFs":
     uploaded_files = st.file_uploader("Upload CV PDFs", accept_multiple_files=True, type=["pdf"])
     preview_uploaded(uploaded_files)
-    
-    dest_folder = st.sidebar.text_input("Folder to save uploaded PDFs:")
-    
-    if uploaded_files and dest_folder:
-        dest_folder = Path(dest_folder)
-        if not dest_folder.exists():
-            dest_folder.mkdir(parents=True, exist_ok=True)
-
-        ts_folder = dest_folder / datetime.now().strftime("%Y%m%d_%H%M%S")
-        ts_folder.mkdir(parents=True, exist_ok=True)
-
-        for f in uploaded_files:
-            path = ts_folder / f.name
-            path.write_bytes(f.read())
-        pdf_folder = ts_folder  
+
+    archive_folder = st.sidebar.text_input("Folder to archive uploaded PDFs (optional):")
+    st.session_state['archive_folder'] = archive_folder or None
+
+    if uploaded_files:
+        # Diparse langsung dari memori; arsip ke disk opsional & di background.
+        # Simpan objek UploadedFile saja: bytes baru disalin saat Analyze diklik
+        pdf_source = list(uploaded_files)
 
 elif mode == "Select Folder":
     folder_path = st.text_input("Enter folder path containing CV PDFs:")
     if folder_path:
         folder = Path(folder_path)
         if folder.exists():
-            pdf_folder = folder
-            st.write(f"Found {len(list(pdf_folder.glob('*.pdf')))} PDF(s) in folder.")
+            pdf_source = folder
+            st.write(f"Found {len(list(pdf_source.glob('*.pdf')))} PDF(s) in folder.")
         else:
             st.warning("Folder does not exist!")
             
 
-if pdf_folder is not None:
-    st.session_state['pdf_folder'] = pdf_folder
+if pdf_source is not None:
+    st.session_state['pdf_source'] = pdf_source
 
 # ===== ANALYSIS =====
-if st.button("Analyze CVs") or 'df_top' in st.session_state:
-
-    if 'pdf_folder' not in st.session_state:
-        st.error("PDF folder not set. Please upload or select CVs first.")
-        st.stop()
-
-    if 'df_top' not in st.session_state:
-        parser = CVPipeline()
-        scorer = CVScorer(
-            job_title=job_title,
-            job_description=job_description,
-            required_skills=required_skills,
-            highlight_keywords=highlight_keywords,
-            weights=weights
-        )
-
-        df = parser.run(st.session_state['pdf_folder'])
-        result_df = scorer.score_dataframe(df)
+# Analisis berjalan sebagai job di worker pool; halaman ini hanya polling
+if "owner" not in st.session_state:
+    st.session_state["owner"] = uuid.uuid4().hex
 
-        df_top = show_results(result_df, top_n)
-        radar_charts(df_top)
-        bar_chart(df_top)
+if st.button("Analyze CVs"):
 
-        df_top = generate_summaries(
-            df_top, job_title, job_description, required_skills
-        )
-        display_summaries(df_top)
+    if 'pdf_source' not in st.session_state:
+        st.error("No CVs selected. Please upload or select CVs first.")
+        st.stop()
 
+    for key in ("df_top", "scored", "summaries", "rag_ready"):
+        st.session_state.pop(key, None)
+
+    source = st.session_state['pdf_source']
+    if isinstance(source, list):
+        source = [(f.name, f.getvalue()) for f in source]
+
+    st.session_state['job_id'] = get_job_manager().submit(
+        run_analysis,
+        source,
+        {
+            "job_title": job_title,
+            "job_description": job_description,
+            "required_skills": required_skills,
+            "highlight_keywords": highlight_keywords,
+            "weights": weights,
+        },
+        top_n,
+        get_encoder(),
+        archive_to=st.session_state.get('archive_folder') if mode == "Upload PDFs" else None,
+        components=get_component_store(),
+        languages=tuple(languages),
+        owner=st.session_state["owner"]
+    )
+
+
+@st.fragment(run_every=1.0)
+def analysis_progress(job_id):
+    manager = get_job_manager()
+    state = manager.status(job_id)
+    if state is None:
+        st.session_state.pop('job_id', None)
+        st.rerun()
+
+    status = state["status"]
+    if status == QUEUED:
+        st.info(f"Analysis queued (position {state.get('queue_position', 0) + 1}).")
+    elif status == RUNNING:
+        st.progress(state["progress"], text=state["message"] or state["stage"])
+
+    if status in (QUEUED, RUNNING):
+        if st.button("Cancel analysis"):
+            manager.cancel(job_id)
+    elif status == FAILED:
+        st.error(f"Analysis failed: {state['error']}")
+    elif status == CANCELLED:
+        st.warning("Analysis cancelled.")
+
+    duplicates_panel(manager.result(job_id, "duplicates"))
+
+    df_top = manager.result(job_id, "top")
+    if df_top is not None:
+        if df_top.empty:
+            st.warning("No CV passed the job title filter.")
+        else:
+            show_results(df_top, top_n)
+            radar_charts(df_top)
+            bar_chart(df_top)
+            if "AI_Summary" in df_top.columns:
+                display_summaries(df_top)
+
+    if status == DONE:
+        st.session_state['duplicates'] = manager.result(job_id, "duplicates")
+        st.session_state['trace_run'] = manager.result(job_id, "trace_run")
+        if df_top is not None and not df_top.empty:
+            st.session_state['df_top'] = df_top
+            st.session_state['scored'] = manager.result(job_id, "scored")
+            if "AI_Summary" in df_top.columns:
+                st.session_state['summaries'] = dict(zip(df_top["cv_id"], df_top["AI_Summary"]))
+        st.session_state.pop('job_id', None)
+        st.rerun()
+
+
+if 'job_id' in st.session_state:
+    analysis_progress(st.session_state['job_id'])
+
+elif 'df_top' in st.session_state:
+    if st.session_state.get('scored') is not None:
+        # Bobot / Top N di sidebar langsung diterapkan ke skor mentah, tanpa scoring ulang
+        df_top = rerank_top(st.session_state['scored'], weights, top_n, st.session_state.get('summaries'))
+        prev = st.session_state['df_top']
+        if not (df_top["cv_id"].tolist() == prev["cv_id"].tolist()
+                and df_top["total_score"].tolist() == prev["total_score"].tolist()):
+            # shortlist atau skornya berubah: index RAG (dan overall_score di prompt) dibangun ulang
+            st.session_state.pop("rag_ready", None)
         st.session_state['df_top'] = df_top
-
-    else:
-        df_top = st.session_state['df_top']
-        show_results(df_top, top_n)
-        radar_charts(df_top)
-        bar_chart(df_top)
-        display_summaries(df_top)
+    df_top = st.session_state['df_top']
+    duplicates_panel(st.session_state.get('duplicates'))
+    show_results(df_top, top_n)
+    radar_charts(df_top)
+    bar_chart(df_top)
+    display_summaries(df_top)
 
 
 # ===== RAG FORM =====
+if st.session_state.get('trace_run'):
+    tracer.use_run(st.session_state['trace_run'])  # Q&A masuk ke trace analisis terakhir
+
 if "df_top" in st.session_state:
 
     st.subheader("🔍 Ask about shortlisted candidates")
@@ -156,20 +228,24 @@ if "df_top" in st.session_state:
                 st.session_state.rag_model
             ) = build_rag(
                 st.session_state["df_top"],
-                top_n=5
+                top_n=5,
+                embedder=get_encoder(),
+                rag_model=get_rag_model()
             )
             st.session_state.rag_ready = True
 
-        # Retrieve
-        top_chunks = st.session_state.retriever.query(query)
-
-        # Answer
-        answer = st.session_state.rag_model.answer(query, top_chunks, job_title, job_description, required_skills)
+        # Retrieve + answer (pertanyaan yang mirip dengan konteks sama diambil dari cache)
+        answer = answer_question(
+            query, st.session_state.retriever, st.session_state.rag_model,
+            job_title, job_description, required_skills, cache=get_answer_cache()
+        )
 
         # ===== OUTPUT BOX =====
         with st.container(border=True):
             st.markdown("### 🧠 AI Recommendation")
             st.markdown(answer)
 
+trace_panel(st.session_state.get('trace_run'))
+
 
 
@@ -0,0 +1,144 @@
+"""
+Semantic RAG answer cache (rag.answer_cache.AnswerCache).
+
+Replays a recruiter-style question log (each question asked several times,
+re-worded) through rag_utils.answer_question with a fake LLM that sleeps
+`--answer-ms` per answer, and reports:
+
+* ask.uncached / ask.cached  – wall time of the log without / with the cache
+* cache                      – hit rate, LLM calls, wrong answers (a hit that
+                               returned the answer of another question)
+* lookup.<entries>           – lookup latency with that many stored entries
+* chunk_ids                  – chunk ids are identical across two index builds
+
+    python benchmarks/bench_answer_cache.py --count 100 --asks 200 --answer-ms 50
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from common import JOB, load_encoder, write_results, report
+from corpus import generate_corpus
+
+QUESTIONS = [
+    "Who fits best for the data analyst role?",
+    "Compare the top 3 candidates on SQL",
+    "Compare the top 3 candidates on Python",
+    "Which candidate has the most dashboard experience?",
+    "Who has worked with stakeholders the longest?",
+    "Which candidate knows Python and statistics?",
+    "Who is the weakest candidate and why?",
+    "Which candidates have a degree in computer science?",
+    "Who has the most years of experience?",
+]
+
+
+def rewordings(q):
+    base = q.rstrip("?")
+    return [q, base.lower() + "?", base + " ?", "  " + q + "  ", base.upper() + "?"]
+
+
+class FakeRAG:
+    """Stands in for RAGModel: fixed latency, answer names the question it was asked."""
+
+    def __init__(self, answer_ms, canonical):
+        self.answer_ms = answer_ms
+        self.canonical = canonical
+        self.model_path = "fake.gguf"
+        self.calls = 0
+
+    def answer(self, question, chunks, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.answer_ms / 1000)
+        return f"answer[{self.canonical[question]}] over {len(chunks)} chunks"
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from rag_utils import answer_question
+    from rag.ingest import CandidateIngestor
+    from rag.retriever import Retriever
+    from rag.answer_cache import AnswerCache
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=100)
+    ap.add_argument("--asks", type=int, default=200)
+    ap.add_argument("--answer-ms", type=float, default=50.0)
+    ap.add_argument("--threshold", type=float, default=0.95)
+    ap.add_argument("--entries", type=int, nargs="+", default=[100, 2000])
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    encoder = load_encoder(a.model)
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    top = CVScorer(model=encoder, title_sim_threshold=a.title_threshold, **JOB).score_dataframe(df).head(10)
+
+    builds = []
+    for _ in range(2):
+        ingestor = CandidateIngestor(embedding_model=encoder)
+        ingestor.ingest_dataframe(top)
+        builds.append(ingestor)
+    retriever = Retriever(builds[0].build_faiss_index(), builds[0].chunks, encoder, top_k=5)
+
+    canonical = {v: i for i, q in enumerate(QUESTIONS) for v in rewordings(q)}
+    rng = random.Random(0)
+    log = [rng.choice(list(canonical)) for _ in range(a.asks)]
+    job = (JOB["job_title"], JOB["job_description"], JOB["required_skills"])
+    stages = {}
+
+    def replay(cache):
+        rag = FakeRAG(a.answer_ms, canonical)
+        wrong = 0
+        t0 = time.perf_counter()
+        for q in log:
+            answer = answer_question(q, retriever, rag, *job, cache=cache)
+            wrong += not answer.startswith(f"answer[{canonical[q]}]")
+        return rag.calls, wrong, time.perf_counter() - t0
+
+    calls, _, wall = replay(None)
+    stages["ask.uncached"] = {"wall_s": round(wall, 4), "asks": len(log), "llm_calls": calls}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnswerCache(Path(tmp) / "answers.sqlite", threshold=a.threshold)
+        calls, wrong, wall = replay(cache)
+        stages["ask.cached"] = {"wall_s": round(wall, 4), "asks": len(log), "llm_calls": calls}
+        stats = cache.stats()
+        stages["cache"] = {"wall_s": 0.0, "hit_rate": stats["hit_rate"], "entries": stats["entries"],
+                           "llm_calls": calls, "distinct_questions": len(set(log)), "wrong_answers": wrong}
+        cache.close()
+
+        # lookup cost as the cache fills: entries share one (job, context) key, worst case
+        dim = encoder.encode(["x"], convert_to_numpy=True).shape[1]
+        vecs = np.random.default_rng(0).standard_normal((max(a.entries), dim)).astype(np.float32)
+        for n in a.entries:
+            cache = AnswerCache(Path(tmp) / f"lookup-{n}.sqlite", max_entries=n)
+            for i in range(n):
+                cache.store("job", "ctx", f"q{i}", vecs[i], "a")
+            t0 = time.perf_counter()
+            for i in range(50):
+                cache.lookup("job", "ctx", vecs[i % n])
+            stages[f"lookup.{n}"] = {"wall_s": round((time.perf_counter() - t0) / 50, 6), "entries": n}
+            cache.close()
+
+    stages["chunk_ids"] = {
+        "wall_s": 0.0,
+        "chunks": len(builds[0].chunks),
+        "identical": [c["id"] for c in builds[0].chunks] == [c["id"] for c in builds[1].chunks],
+    }
+
+    out = write_results("answer_cache", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
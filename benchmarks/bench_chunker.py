@@ -0,0 +1,109 @@
+"""
+RAG chunking: the original 600-character windows (`char`) vs the sentence /
+token-aware chunker with per-CV de-duplication (`token`).
+
+For every chunker: chunk count, characters embedded, index build time, search
+latency and retrieval quality. Queries are "<object> <outcome>" phrases taken
+from the corpus ground truth (e.g. "sales dashboards for regional managers");
+a CV is relevant when one of its summary / experience sentences has both.
+Retrieval goes through Retriever.query (one chunk per CV), scored with
+precision@k, hit@k and MRR.
+
+    python benchmarks/bench_chunker.py --count 200 --queries 200 --model all-MiniLM-L6-v2
+"""
+import sys
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+
+from common import JOB, load_encoder, write_results, report
+from corpus import generate_corpus, OBJECTS, OUTCOMES
+
+
+def ground_truth(manifest, n_queries, seed=0):
+    """[(query, {relevant cv_id})] from the sentences in manifest.json."""
+    sentences = {}
+    for cv_id, cv in manifest["cvs"].items():
+        texts = cv["summary"].split(". ") + [b for job in cv["experience"] for b in job["bullets"]]
+        sentences[cv_id] = [t.lower() for t in texts]
+
+    pairs = sorted({(o, u) for texts in sentences.values() for t in texts
+                    for o in OBJECTS if o in t for u in OUTCOMES if u in t})
+    random.Random(seed).shuffle(pairs)
+
+    out = []
+    for o, u in pairs[:n_queries]:
+        relevant = {cv for cv, texts in sentences.items() if any(o in t and u in t for t in texts)}
+        out.append((f"{o} {u}", relevant))
+    return out
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from rag.chunker import CHUNKERS
+    from rag.ingest import CandidateIngestor
+    from rag.retriever import Retriever
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=200)
+    ap.add_argument("--jobs", type=int, default=3)
+    ap.add_argument("--bullets-per-job", type=int, default=8)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    corpus = generate_corpus(count=a.count, jobs=a.jobs, bullets_per_job=a.bullets_per_job)
+    queries = ground_truth(json.loads((corpus / "manifest.json").read_text()), a.queries)
+    encoder = load_encoder(a.model)
+    df = CVPipeline().run(corpus)
+    scored = CVScorer(model=encoder, title_sim_threshold=a.title_threshold, **JOB).score_dataframe(df)
+
+    stages = {}
+    for kind in CHUNKERS:
+        ingestor = CandidateIngestor(embedding_model=encoder, chunker=kind)
+        t0 = time.perf_counter()
+        ingestor.ingest_dataframe(scored)
+        chunk_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index = ingestor.build_faiss_index()
+        build_s = time.perf_counter() - t0
+
+        retriever = Retriever(index, ingestor.chunks, encoder, top_k=a.k)
+        precision, hits, rr = [], [], []
+        t0 = time.perf_counter()
+        for query, relevant in queries:
+            found = [c["meta"]["cv_id"] for c in retriever.query(query)]
+            flags = [cv in relevant for cv in found]
+            precision.append(sum(flags) / a.k)
+            hits.append(any(flags))
+            rr.append(next((1 / (i + 1) for i, f in enumerate(flags) if f), 0.0))
+        search_s = time.perf_counter() - t0
+
+        texts = [c["text"] for c in ingestor.chunks]
+        stages[f"chunk.{kind}"] = {
+            "wall_s": round(chunk_s + build_s, 4),
+            "chunk_s": round(chunk_s, 4),
+            "chunks": len(texts),
+            "chars_embedded": sum(map(len, texts)),
+            "max_chunk_chars": max(map(len, texts)),
+            "search_ms_per_query": round(1000 * search_s / len(queries), 3),
+            f"precision_at_{a.k}": round(float(np.mean(precision)), 4),
+            f"hit_at_{a.k}": round(float(np.mean(hits)), 4),
+            "mrr": round(float(np.mean(rr)), 4),
+        }
+
+    out = write_results("chunker", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Duplicate detection: runtime and precision/recall against the corpus manifest.
+
+Copies in the corpus are re-rendered CVs under a new file name; half of them
+get a light edit (an extra summary sentence) to exercise near-duplicate matching.
+
+    python benchmarks/bench_dedup.py --count 2000 --duplicate-rate 0.15
+"""
+import sys
+import json
+import time
+import argparse
+from itertools import combinations
+
+from common import write_results, report
+from corpus import generate_corpus
+
+
+def cluster_pairs(groups):
+    return {tuple(sorted(p)) for g in groups for p in combinations(g, 2)}
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.dedup import deduplicate
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=1000)
+    ap.add_argument("--duplicate-rate", type=float, default=0.15)
+    ap.add_argument("--threshold", type=float, default=0.8)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    corpus = generate_corpus(count=a.count, duplicate_rate=a.duplicate_rate)
+    manifest = json.loads((corpus / "manifest.json").read_text())["cvs"]
+    df = CVPipeline().run(corpus)
+
+    # light edits on every other copy
+    seen = {}
+    for i, cv_id in enumerate(df["cv_id"]):
+        key = json.dumps(manifest[cv_id], sort_keys=True)
+        if key in seen and len(seen[key]) % 2:
+            df.loc[i, "summary"] += " also mentored two junior analysts."
+        seen.setdefault(key, []).append(cv_id)
+    truth = cluster_pairs(g for g in seen.values() if len(g) > 1)
+
+    t0 = time.perf_counter()
+    unique, clusters = deduplicate(df, a.threshold)
+    wall = time.perf_counter() - t0
+
+    found = cluster_pairs([c["representative"], *c["duplicates"]] for _, c in clusters.iterrows())
+    tp = len(found & truth)
+    stages = {"dedup": {
+        "wall_s": round(wall, 4),
+        "cvs": len(df),
+        "removed": len(df) - len(unique),
+        "removed_pct": round(100 * (len(df) - len(unique)) / len(df), 1),
+        "pair_precision": round(tp / len(found), 4) if found else 1.0,
+        "pair_recall": round(tp / len(truth), 4) if truth else 1.0,
+    }}
+
+    out = write_results("dedup", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
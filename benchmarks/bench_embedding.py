@@ -0,0 +1,90 @@
+"""
+Per-row embedding calls vs the length-bucketed EmbeddingScheduler.
+
+Counts encoder calls and padded tokens (every batch is padded to its longest
+member, as sentence-transformers does) for CVScorer(scheduled=False) and
+CVScorer(scheduled=True), and checks that the scores match.
+
+    python benchmarks/bench_embedding.py --count 500 --model all-MiniLM-L6-v2
+"""
+import sys
+import time
+import argparse
+
+from common import JOB, load_encoder, write_results, report
+from corpus import generate_corpus
+
+
+class PaddingCounter:
+    """Wraps an encoder and counts calls, real tokens and padded tokens per batch."""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = self.tokens = self.padded = 0
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _lengths(self, texts):
+        from core.embed_scheduler import EmbeddingScheduler
+        return EmbeddingScheduler(self.model).token_lengths(texts)
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        if texts:
+            # sentence-transformers mengurutkan per panjang karakter (desc) sebelum batching
+            ordered = sorted(texts, key=len, reverse=True)
+            lengths = self._lengths(ordered)
+            self.calls += 1
+            self.tokens += int(lengths.sum())
+            for b in range(0, len(ordered), batch_size):
+                batch = lengths[b:b + batch_size]
+                self.padded += int(batch.max()) * len(batch)
+        return self.model.encode(sentences, batch_size=batch_size, **kwargs)
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from core.quantize import ranking_agreement
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=500)
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--batch-size", type=int, default=32, help="batch size of the per-row path")
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    encoder = load_encoder(a.model)
+
+    stages, scores = {}, {}
+    for mode, scheduled in (("per_row", False), ("scheduled", True)):
+        counter = PaddingCounter(encoder)
+        scorer = CVScorer(model=counter, batch_size=a.batch_size, title_sim_threshold=a.title_threshold,
+                          scheduled=scheduled, **JOB)
+        counter.calls = counter.tokens = counter.padded = 0  # tanpa encode job title / description
+
+        t0 = time.perf_counter()
+        scores[mode] = scorer.score_dataframe(df.copy()).set_index("cv_id")["total_score"]
+        stages[f"score.{mode}"] = {
+            "wall_s": round(time.perf_counter() - t0, 4),
+            "cvs": len(scores[mode]),
+            "encode_calls": counter.calls,
+            "tokens": counter.tokens,
+            "padded_tokens": counter.padded,
+            "padding_overhead_pct": round(100 * (counter.padded / counter.tokens - 1), 1) if counter.tokens else 0.0,
+        }
+
+    ref = scores["per_row"]
+    stages["score.scheduled"].update(ranking_agreement(ref.values, scores["scheduled"].reindex(ref.index).values))
+
+    out = write_results("embedding", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Throughput scaling of the multi-process EncodePool from 1 to N workers.
+
+Encodes corpus sentences in-process (all cores as torch threads) and through
+EncodePool with 1..N workers, and optionally scores the corpus with
+CVScorer(model=pool). Worker counts above os.cpu_count() are skipped.
+
+    python benchmarks/bench_encode_pool.py --model all-MiniLM-L6-v2 --workers 1 2 4 8 16 32
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from common import JOB, load_encoder, write_results, report
+from corpus import generate_corpus
+
+
+def corpus_sentences(df, limit):
+    out = []
+    for col in ("summary", "experience", "education"):
+        for text in df[col]:
+            out += [s.strip() for s in str(text).split(".") if len(s.strip()) > 15]
+    return (out * (limit // max(1, len(out)) + 1))[:limit]
+
+
+def bench_loader(model_name, threads=None):
+    """Runs inside the workers: stub / model name, same as the other benchmarks."""
+    if threads and model_name != "stub":
+        import torch
+        torch.set_num_threads(threads)
+    return load_encoder(model_name)
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from core.encode_pool import EncodePool
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    ap.add_argument("--threads", type=int, default=None, help="threads per worker (default: cores / workers)")
+    ap.add_argument("--count", type=int, default=200)
+    ap.add_argument("--sentences", type=int, default=20000)
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--score", action="store_true", help="also time CVScorer.score_dataframe on the pool")
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    sentences = corpus_sentences(df, a.sentences)
+
+    def run(encoder):
+        encoder.encode(sentences[:a.batch_size], batch_size=a.batch_size)  # warm-up
+        t0 = time.perf_counter()
+        emb = encoder.encode(sentences, batch_size=a.batch_size, normalize_embeddings=True)
+        rec = {"wall_s": round(time.perf_counter() - t0, 4), "sentences": len(sentences)}
+        rec["sentences_per_s"] = round(len(sentences) / rec["wall_s"], 1)
+        if a.score:
+            t0 = time.perf_counter()
+            CVScorer(model=encoder, batch_size=a.batch_size, title_sim_threshold=-1.0, **JOB).score_dataframe(df.copy())
+            rec["score_s"] = round(time.perf_counter() - t0, 4)
+        return rec, emb
+
+    stages = {}
+    base, ref = run(bench_loader(a.model, cores))
+    stages["encode.in_process"] = {**base, "threads": cores}
+
+    for w in a.workers:
+        if w > cores:
+            stages[f"encode.pool_{w}"] = {"skipped": f"only {cores} core(s)"}
+            continue
+        threads = a.threads or max(1, cores // w)
+        with EncodePool(workers=w, loader=bench_loader, model_name=a.model, threads=threads) as pool:
+            rec, emb = run(pool)
+        rec.update(workers=w, threads=threads,
+                   speedup=round(rec["sentences_per_s"] / base["sentences_per_s"], 2),
+                   max_abs_diff=float(np.abs(emb - ref).max()))
+        stages[f"encode.pool_{w}"] = rec
+
+    out = write_results("encode_pool", {**{k: v for k, v in vars(a).items() if k != "out"}, "cores": cores}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Encoder backends: throughput (sentences/sec) and drift against the torch backend.
+
+Drift is the cosine between each backend's embedding and the torch embedding of
+the same sentence, plus the CVScorer total_score ranking agreement. Backends
+whose dependencies are missing are reported with an error instead of failing.
+
+    python benchmarks/bench_encoders.py --model all-MiniLM-L6-v2 --count 200 --threads 4
+    python benchmarks/bench_encoders.py --backends torch torch-int8 --max-seq-length 128
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from common import JOB, write_results, report
+from corpus import generate_corpus
+
+
+def corpus_sentences(df, limit):
+    out = []
+    for col in ("summary", "experience", "education"):
+        for text in df[col]:
+            out += [s.strip() for s in str(text).split(".") if len(s.strip()) > 15]
+    return out[:limit]
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from core.encoders import ENCODER_BACKENDS, load_encoder
+    from core.quantize import ranking_agreement
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--model", default="all-MiniLM-L6-v2")
+    ap.add_argument("--backends", nargs="+", choices=ENCODER_BACKENDS, default=list(ENCODER_BACKENDS))
+    ap.add_argument("--count", type=int, default=200)
+    ap.add_argument("--sentences", type=int, default=2000)
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--max-seq-length", type=int, default=None)
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    sentences = corpus_sentences(df, a.sentences)
+    backends = ["torch"] + [b for b in a.backends if b != "torch"]
+
+    stages, ref_emb, ref_scores = {}, None, None
+    for backend in backends:
+        try:
+            t0 = time.perf_counter()
+            encoder = load_encoder(a.model, backend=backend, threads=a.threads, max_seq_length=a.max_seq_length)
+            load = time.perf_counter() - t0
+        except (ImportError, OSError, ValueError) as e:
+            stages[f"encode.{backend}"] = {"error": f"{type(e).__name__}: {e}"[:200]}
+            continue
+
+        encoder.encode(sentences[:a.batch_size], batch_size=a.batch_size)  # warm-up
+        t0 = time.perf_counter()
+        emb = encoder.encode(sentences, batch_size=a.batch_size, normalize_embeddings=True)
+        wall = time.perf_counter() - t0
+
+        scorer = CVScorer(model=encoder, batch_size=a.batch_size, title_sim_threshold=a.title_threshold, **JOB)
+        scores = scorer.score_dataframe(df.copy()).set_index("cv_id")["total_score"]
+        if ref_emb is None:
+            ref_emb, ref_scores = emb, scores
+
+        cos = (emb * ref_emb).sum(axis=1)
+        agree = ranking_agreement(ref_scores.values, scores.reindex(ref_scores.index).values)
+        stages[f"encode.{backend}"] = {
+            "wall_s": round(wall, 4),
+            "load_s": round(load, 3),
+            "sentences": len(sentences),
+            "sentences_per_s": round(len(sentences) / wall, 1),
+            "cos_to_torch_mean": round(float(cos.mean()), 5),
+            "cos_to_torch_min": round(float(cos.min()), 5),
+            **{f"score_{k}": v for k, v in agree.items()},
+        }
+
+    out = write_results("encoders", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Text vs layout-aware extraction: throughput and header-detection accuracy.
+
+Uses a corpus with appendix pages and header-like distractor lines. A section
+counts as correctly detected when the token set of the extracted text has a
+Jaccard similarity >= 0.8 with the ground truth from manifest.json.
+
+    python benchmarks/bench_extraction.py --count 200 --appendix-pages 3 --max-pages 4
+"""
+import sys
+import json
+import time
+import argparse
+
+import fitz
+
+from common import write_results, report
+from corpus import generate_corpus
+
+SECTIONS = ["title", "summary", "experience", "skills", "education"]
+
+
+def _tokens(text):
+    return set(str(text).replace(",", " ").replace(".", " ").split())
+
+
+def truth_sections(cv: dict, parser, distractors: bool) -> dict:
+    exp = []
+    for job in cv["experience"]:
+        exp.append(job["header"])
+        exp.extend(job["bullets"])
+        if distractors:
+            exp.append("Delivered internal workshops as part of training")
+    raw = {
+        "title": cv["title"],
+        "summary": cv["summary"],
+        "experience": " ".join(exp),
+        "skills": ", ".join(cv["skills"]),
+        "education": cv["education"],
+    }
+    return {k: parser.clean_line(v) for k, v in raw.items()}
+
+
+def accuracy(extracted: dict, truth: dict) -> dict:
+    hits = {}
+    for k in SECTIONS:
+        a, b = _tokens(extracted.get(k, "")), _tokens(truth[k])
+        union = a | b
+        hits[k] = (len(a & b) / len(union) if union else 1.0) >= 0.8
+    return hits
+
+
+def bench_mode(corpus, manifest, extraction, max_pages):
+    from core.parser import CVPipeline
+
+    parser = CVPipeline(extraction=extraction, max_pages=max_pages)
+    pdfs = sorted(corpus.glob("*.pdf"))
+    distractors = manifest["params"].get("distractors", False)
+
+    pages = sum(len(fitz.open(p)) for p in pdfs)
+    t0 = time.perf_counter()
+    parsed = [parser.parse_pdf(p) for p in pdfs]
+    wall = time.perf_counter() - t0
+
+    per_section = {k: 0 for k in SECTIONS}
+    for feat in parsed:
+        truth = truth_sections(manifest["cvs"][feat["cv_id"]], parser, distractors)
+        for k, ok in accuracy(feat, truth).items():
+            per_section[k] += ok
+
+    n = len(parsed)
+    return {
+        "wall_s": round(wall, 4),
+        "cvs_per_s": round(n / wall, 1),
+        "pages_per_s": round(pages / wall, 1),
+        "header_accuracy": round(sum(per_section.values()) / (n * len(SECTIONS)), 4),
+        **{f"acc_{k}": round(v / n, 4) for k, v in per_section.items()},
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=200)
+    ap.add_argument("--appendix-pages", type=int, default=3)
+    ap.add_argument("--no-distractors", action="store_true")
+    ap.add_argument("--max-pages", type=int, default=None, help="page cap for layout mode")
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    corpus = generate_corpus(count=a.count, appendix_pages=a.appendix_pages,
+                             distractors=not a.no_distractors)
+    manifest = json.loads((corpus / "manifest.json").read_text())
+
+    stages = {
+        "extract.text": bench_mode(corpus, manifest, "text", None),
+        "extract.layout": bench_mode(corpus, manifest, "layout", a.max_pages),
+    }
+    out = write_results("extraction", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Header matching cost per line as the alias dictionary grows.
+
+Compares the previous nested-loop matcher with CVPipeline.match_header on the
+cleaned lines of a synthetic corpus, padding the dictionary with generated
+aliases up to each requested size.
+
+    python benchmarks/bench_headers.py --aliases 30 100 300 1000
+"""
+import sys
+import time
+import argparse
+
+from common import write_results, report
+from corpus import generate_corpus
+
+
+def nested_loop_match(headers, line):
+    for feature, aliases in headers.items():
+        for h in aliases:
+            if line == h or line.startswith(h + ":"):
+                return feature
+    return None
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=200)
+    ap.add_argument("--aliases", type=int, nargs="+", default=[30, 100, 300, 1000])
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    base = CVPipeline(languages=())
+    lines = []
+    for pdf in sorted(generate_corpus(count=a.count).glob("*.pdf")):
+        lines += [ln for ln in map(base.clean_line, base.pdf_to_text(pdf).split("\n")) if ln]
+    candidates = [ln for ln in lines if base.is_header_line(ln)]
+
+    stages = {}
+    features = list(CVPipeline.FEATURE_HEADERS)
+    for n in a.aliases:
+        headers = {f: list(v) for f, v in CVPipeline.FEATURE_HEADERS.items()}
+        i = 0
+        while sum(map(len, headers.values())) < n:
+            headers[features[i % len(features)]].append(f"extra header alias {i}")
+            i += 1
+        parser = CVPipeline(languages=(), header_aliases=headers)
+
+        t0 = time.perf_counter()
+        old = [nested_loop_match(headers, ln) for ln in candidates]
+        t_old = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new = [parser.match_header(ln) for ln in candidates]
+        t_new = time.perf_counter() - t0
+
+        assert old == new, "matchers disagree"
+        stages[f"match.nested_loop.{n}"] = {"wall_s": round(t_old, 6), "lines": len(candidates)}
+        stages[f"match.index.{n}"] = {"wall_s": round(t_new, 6), "lines": len(candidates),
+                                      "speedup": round(t_old / t_new, 1) if t_new else None}
+
+    out = write_results("headers", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
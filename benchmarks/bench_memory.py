@@ -0,0 +1,101 @@
+"""
+Peak RSS and frame size of the default vs compact (CVPipeline(compact=True)) pool.
+
+Each mode runs in its own subprocess so ru_maxrss is not shared; growth is the
+peak RSS above the baseline once the libraries are imported. Parsed rows
+are replicated (with unique text per copy) up to --rows to reach large-pool
+sizes without rendering that many PDFs; scoring uses the stub encoder.
+
+    python benchmarks/bench_memory.py --count 200 --rows 50000
+"""
+import sys
+import json
+import time
+import resource
+import argparse
+import subprocess
+
+from common import JOB, write_results, report, load_encoder
+from corpus import generate_corpus
+
+
+def _rss_mb():
+    # Linux: KiB, macOS: bytes
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def child(mode: str, count: int, rows: int, score: bool) -> dict:
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+
+    parser = CVPipeline(compact=mode == "compact")
+    base = [parser.parse_pdf(p) for p in sorted(generate_corpus(count=count).glob("*.pdf"))]
+
+    feats = []
+    for i in range(max(rows, len(base))):
+        src = base[i % len(base)]
+        copy = i // len(base)
+        feat = {k: (f"{v} r{copy}" if copy and k in ("summary", "experience") else v) for k, v in src.items()}
+        feat["cv_id"] = f"{copy}-{src['cv_id']}"
+        feat["skills_list"] = list(src["skills_list"])
+        feats.append(feat)
+    del base
+
+    # torch & co. sudah diimport: peak berikutnya dibandingkan dengan baseline ini
+    rec = {"rows": len(feats), "rss_baseline_mb": _rss_mb()}
+    t0 = time.perf_counter()
+    df = parser.build_frame(feats)
+    del feats
+    rec["build_s"] = round(time.perf_counter() - t0, 4)
+    rec["frame_mb"] = round(df.memory_usage(deep=True).sum() / 1e6, 1)
+    rec["peak_rss_parse_mb"] = _rss_mb()
+    rec["parse_growth_mb"] = round(rec["peak_rss_parse_mb"] - rec["rss_baseline_mb"], 1)
+
+    if score:
+        t0 = time.perf_counter()
+        scorer = CVScorer(model=load_encoder("stub"), title_sim_threshold=-1.0, **JOB)
+        scored = scorer.score_dataframe(df)
+        rec["score_s"] = round(time.perf_counter() - t0, 4)
+        rec["scored_frame_mb"] = round(scored.memory_usage(deep=True).sum() / 1e6, 1)
+        rec["peak_rss_score_mb"] = _rss_mb()
+        rec["score_growth_mb"] = round(rec["peak_rss_score_mb"] - rec["rss_baseline_mb"], 1)
+    return rec
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=200, help="distinct CV PDFs in the corpus")
+    ap.add_argument("--rows", type=int, default=50000, help="pool size after replication")
+    ap.add_argument("--no-score", action="store_true", help="only measure parsing / enrichment")
+    ap.add_argument("--child", choices=["default", "compact"], help=argparse.SUPPRESS)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    if a.child:
+        print(json.dumps(child(a.child, a.count, a.rows, not a.no_score)))
+        return 0
+
+    generate_corpus(count=a.count)
+    stages = {}
+    for mode in ("default", "compact"):
+        cmd = [sys.executable, __file__, "--child", mode, "--count", str(a.count), "--rows", str(a.rows)]
+        if a.no_score:
+            cmd.append("--no-score")
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        stages[f"memory.{mode}"] = json.loads(out.strip().splitlines()[-1])
+
+    d, c = stages["memory.default"], stages["memory.compact"]
+    c["frame_reduction_pct"] = round(100 * (1 - c["frame_mb"] / d["frame_mb"]), 1)
+    key = "parse_growth_mb" if a.no_score else "score_growth_mb"
+    c["rss_growth_reduction_pct"] = round(100 * (1 - c[key] / d[key]), 1) if d[key] else None
+
+    params = {k: v for k, v in vars(a).items() if k not in ("out", "child")}
+    out = write_results("memory", params, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
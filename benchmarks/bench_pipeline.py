@@ -0,0 +1,134 @@
+"""
+End-to-end stage benchmark on a synthetic corpus.
+
+Times PDF parse, feature extraction, enrichment, the pooled embedding pass,
+every CVScorer stage (served from the embedding cache), FAISS index build and
+retrieval separately and writes the result as JSON.
+
+    python benchmarks/bench_pipeline.py --count 1000 --model stub
+    python benchmarks/bench_pipeline.py --count 1000 --baseline benchmarks/results/pipeline-abc123.json
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from common import JOB, timed, load_encoder, write_results, compare, report
+from corpus import generate_corpus
+
+QUERIES = [
+    "who has the most sql experience?",
+    "which candidate built dashboards for stakeholders?",
+    "compare the top candidates on python",
+    "who fits best for data analyst?",
+]
+
+
+def run(corpus: Path, model_name: str, retrieval_queries: int, title_threshold: float = -1.0):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from rag.ingest import CandidateIngestor
+    from rag.retriever import Retriever
+
+    stages = {}
+    encoder = load_encoder(model_name)
+    pdfs = sorted(corpus.glob("*.pdf"))
+    parser = CVPipeline()
+
+    with timed(stages, "parse.pdf_to_text", items=len(pdfs)):
+        texts = [(p.name, parser.pdf_to_text(p)) for p in pdfs]
+
+    with timed(stages, "parse.extract_features", items=len(texts)):
+        rows = []
+        for name, text in texts:
+            feat = parser.extract_features(text)
+            feat["cv_id"] = name
+            for k in feat:
+                feat[k] = parser.clean_line(feat[k])
+            if not feat["title"]:
+                feat["title"] = parser.infer_title_from_experience(feat["experience"])
+            feat["skills_list"] = [s.strip() for s in feat["skills"].split(",") if s.strip()]
+            rows.append(feat)
+        df = pd.DataFrame(rows)
+
+    with timed(stages, "parse.enrich", items=len(df)):
+        df = parser.enrich_experience(df)
+        df["education_enriched"] = df["education"].apply(parser.enrich_education)
+
+    with timed(stages, "score.init"):
+        scorer = CVScorer(model=encoder, title_sim_threshold=title_threshold, **JOB)
+
+    with timed(stages, "score.title_gate", items=len(df)) as rec:
+        df = scorer.filter_by_title(df)
+        rec["passed"] = len(df)
+
+    with timed(stages, "score.embed", items=len(df)) as rec:
+        skills = df["skills_list"]
+        scorer.prefetch(scorer.pool_texts(skills, df["summary"], df["education_enriched"], df["experience_enriched"]))
+        rec["texts"] = len(scorer._emb_cache)
+
+    columns = [
+        ("score.skills", "score_skills", scorer.score_skills, "skills_list"),
+        ("score.summary", "summary_raw", scorer.score_summaries, "summary"),
+        ("score.education", "edu_raw", scorer.score_education_raw, "education_enriched"),
+        ("score.experience", "exp_raw", scorer.score_experience_raw, "experience_enriched"),
+    ]
+    for stage, out_col, fn, in_col in columns:
+        with timed(stages, stage, items=len(df)):
+            # summary dinilai untuk seluruh kolom sekaligus
+            df[out_col] = fn(df[in_col]) if stage == "score.summary" else df[in_col].apply(fn)
+
+    # end-to-end scorer call (gate + all scorers + normalization) feeds the index build
+    with timed(stages, "score.dataframe", items=len(df)):
+        scored = scorer.score_dataframe(df)
+
+    with timed(stages, "rag.build_faiss_index") as rec:
+        ingestor = CandidateIngestor(embedding_model=encoder)
+        ingestor.ingest_dataframe(scored)
+        index = ingestor.build_faiss_index()
+        rec["chunks"] = len(ingestor.chunks)
+
+    retriever = Retriever(index=index, chunks=ingestor.chunks, embedder=encoder, top_k=5)
+    with timed(stages, "rag.retrieve", items=retrieval_queries):
+        for i in range(retrieval_queries):
+            retriever.query(QUERIES[i % len(QUERIES)])
+
+    return stages
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=100, help="CVs in the corpus (e.g. 100 / 1000 / 10000)")
+    ap.add_argument("--summary-sentences", type=int, default=3)
+    ap.add_argument("--jobs", type=int, default=2)
+    ap.add_argument("--bullets-per-job", type=int, default=4)
+    ap.add_argument("--model", default="stub", help="'stub' for offline runs or a sentence-transformers model name")
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--title-threshold", type=float, default=-1.0,
+                    help="title gate threshold; -1 lets every CV through so scorer stages see the whole corpus")
+    ap.add_argument("--out", default=None)
+    ap.add_argument("--baseline", default=None, help="previous result JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown per stage")
+    a = ap.parse_args(argv)
+
+    corpus = generate_corpus(count=a.count, summary_sentences=a.summary_sentences,
+                             jobs=a.jobs, bullets_per_job=a.bullets_per_job)
+    stages = run(corpus, a.model, a.queries, a.title_threshold)
+    params = {k: v for k, v in vars(a).items() if k not in ("out", "baseline")}
+    out = write_results("pipeline", params, stages, a.out)
+
+    report(stages)
+    print(f"results: {out}")
+
+    if a.baseline:
+        regressions = compare(json.loads(out.read_text()), json.loads(Path(a.baseline).read_text()), a.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']}: {r['baseline_s']:.4f}s -> {r['current_s']:.4f}s (x{r['ratio']})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Quantized embeddings: memory per chunk and ranking agreement with float32.
+
+* index.<type>  – FAISS index size and recall@k of flat / sq8 / fp16 / pq against exact search
+* store.<dtype> – QuantizedMatrix size and top-k agreement of brute-force search on
+                  the chunk embeddings stored at that dtype
+* score.<dtype> – CVScorer(embedding_dtype=...) total_score ranking vs float32
+
+    python benchmarks/bench_quantization.py --count 500 --model stub --k 10
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from common import JOB, load_encoder, write_results, report
+from corpus import generate_corpus
+
+
+def recall_at_k(exact_scores, ids, k):
+    """
+    Share of returned ids that belong to the exact top-k. Scored against the
+    k-th exact score so ties (duplicate chunks) do not count as misses.
+    """
+    kth = -np.partition(-exact_scores, k - 1, axis=1)[:, k - 1:k]
+    return float(np.mean(np.take_along_axis(exact_scores, ids, axis=1) >= kth - 1e-6))
+
+
+def main(argv=None):
+    import faiss
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from core.quantize import EMBEDDING_DTYPES, QuantizedMatrix, ranking_agreement
+    from rag.ingest import CandidateIngestor, INDEX_TYPES
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=500)
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=200, help="chunk texts reused as retrieval queries")
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    encoder = load_encoder(a.model)
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    stages = {}
+
+    # ---- scoring on quantized embeddings
+    scored = {}
+    for dtype in EMBEDDING_DTYPES:
+        t0 = time.perf_counter()
+        scorer = CVScorer(model=encoder, title_sim_threshold=a.title_threshold, embedding_dtype=dtype, **JOB)
+        scored[dtype] = scorer.score_dataframe(df.copy()).set_index("cv_id")["total_score"]
+        rec = {"wall_s": round(time.perf_counter() - t0, 4), "cvs": len(scored[dtype])}
+        ref = scored["float32"]
+        rec.update(ranking_agreement(ref.values, scored[dtype].reindex(ref.index).values, a.k))
+        stages[f"score.{dtype}"] = rec
+
+    # ---- index + stored embeddings
+    ranked = CVScorer(model=encoder, title_sim_threshold=a.title_threshold, **JOB).score_dataframe(df.copy())
+    rng = np.random.default_rng(0)
+    emb = None
+    for index_type in INDEX_TYPES:
+        ingestor = CandidateIngestor(embedding_model=encoder, index_type=index_type)
+        ingestor.ingest_dataframe(ranked)
+        t0 = time.perf_counter()
+        index = ingestor.build_faiss_index()
+        build = time.perf_counter() - t0
+
+        if emb is None:
+            emb = encoder.encode([c["text"] for c in ingestor.chunks], batch_size=32, convert_to_numpy=True,
+                                 normalize_embeddings=True).astype(np.float32, copy=False)
+            n = len(ingestor.chunks)
+            queries = emb[rng.choice(n, size=min(a.queries, n), replace=False)]
+            exact = queries @ emb.T
+        t0 = time.perf_counter()
+        _, ids = index.search(queries, a.k)
+        search = time.perf_counter() - t0
+
+        size = len(faiss.serialize_index(index))
+        stages[f"index.{index_type}"] = {
+            "wall_s": round(build, 4),
+            "chunks": n,
+            "bytes_per_chunk": round(size / n, 1),  # = MB per million chunks
+            "search_ms_per_query": round(1000 * search / len(queries), 4),
+            f"recall_at_{a.k}": round(recall_at_k(exact, ids, a.k), 4),
+        }
+
+    for dtype in EMBEDDING_DTYPES:
+        t0 = time.perf_counter()
+        stored = QuantizedMatrix.from_float(emb, dtype)
+        ids = np.argsort(-stored.dot(queries), axis=1)[:, :a.k]
+        stages[f"store.{dtype}"] = {
+            "wall_s": round(time.perf_counter() - t0, 4),
+            "bytes_per_chunk": round(stored.nbytes / n, 1),
+            "vs_float32_bytes": round(stored.nbytes / emb.nbytes, 3),
+            f"recall_at_{a.k}": round(recall_at_k(exact, ids, a.k), 4),
+        }
+
+    out = write_results("quantization", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Re-ranking stored raw components (core.rerank) vs scoring the pool again.
+
+* score.full     – CVScorer.score_dataframe on the parsed corpus
+* rescore        – the same pool scored again with other weights (what the UI used to do)
+* rerank.<rows>  – rerank() with those weights on the components, replicated to <rows> CVs;
+                   `identical` checks the base pool against `rescore`
+* store.save / store.load – ComponentStore round trip
+
+    python benchmarks/bench_rerank.py --count 500 --rows 1000 10000 100000
+"""
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from common import JOB, load_encoder, write_results, report
+from corpus import generate_corpus
+
+NEW_WEIGHTS = {"experience": 0.1, "skills": 0.2, "summary": 0.3, "education": 0.4}
+
+
+def _ranked(df):
+    cols = ["cv_id", "total_score"]
+    return df[cols].sort_values(["total_score", "cv_id"], ascending=[False, True]).reset_index(drop=True)
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from core.rerank import ComponentStore, job_hash, pool_manifest, rerank
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=500)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--top-n", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    encoder = load_encoder(a.model)
+    stages = {}
+
+    def score(weights):
+        job = {**JOB, "weights": weights}
+        t0 = time.perf_counter()
+        out = CVScorer(model=encoder, title_sim_threshold=a.title_threshold, **job).score_dataframe(df.copy())
+        return out, round(time.perf_counter() - t0, 4)
+
+    scored, wall = score(JOB["weights"])
+    stages["score.full"] = {"wall_s": wall, "cvs": len(scored)}
+    rescored, wall = score(NEW_WEIGHTS)
+    stages["rescore"] = {"wall_s": wall, "cvs": len(rescored)}
+
+    for rows in a.rows:
+        reps = -(-rows // len(scored))
+        pool = pd.concat([scored] * reps, ignore_index=True).head(rows)
+        pool["cv_id"] = [f"{c}#{i}" for i, c in enumerate(pool["cv_id"])]
+
+        times = []
+        for _ in range(a.repeat):
+            t0 = time.perf_counter()
+            top = rerank(pool, NEW_WEIGHTS, a.top_n)
+            times.append(time.perf_counter() - t0)
+        stages[f"rerank.{rows}"] = {"wall_s": round(float(np.median(times)), 6), "cvs": rows}
+
+    stages[f"rerank.{len(scored)}.identical"] = {
+        "wall_s": 0.0,
+        "identical": bool(np.allclose(_ranked(rerank(scored, NEW_WEIGHTS))["total_score"],
+                                      _ranked(rescored)["total_score"])
+                          and set(_ranked(rerank(scored, NEW_WEIGHTS, a.top_n))["cv_id"])
+                          == set(_ranked(rescored.head(a.top_n))["cv_id"])),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ComponentStore(tmp)
+        key = (pool_manifest(df), job_hash(JOB))
+        t0 = time.perf_counter()
+        store.save(*key, scored)
+        stages["store.save"] = {"wall_s": round(time.perf_counter() - t0, 6),
+                                "bytes": store.path(*key).stat().st_size}
+        t0 = time.perf_counter()
+        store.load(*key)
+        stages["store.load"] = {"wall_s": round(time.perf_counter() - t0, 6)}
+        t0 = time.perf_counter()
+        pool_manifest(df)
+        stages["store.manifest"] = {"wall_s": round(time.perf_counter() - t0, 6), "cvs": len(df)}
+
+    out = write_results("rerank", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
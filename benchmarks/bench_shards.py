@@ -0,0 +1,128 @@
+"""
+Sharded scoring (core.shards.ShardCoordinator) with 1..N local worker processes.
+
+* single          – CVPipeline + CVScorer in this process (the baseline)
+* shards.<n>      – coordinator + n spawned workers: CVs/sec, speed-up and whether
+                    the global top K equals the single-process top K
+* shards.retry    – the same with one worker killed mid-run (`--crash-after`
+                    encode calls): the run must still finish with the same top K
+
+Duplicates are not removed in either path (workers only see their own shard).
+
+    python benchmarks/bench_shards.py --count 1000 --workers 1 2 4 --shard-size 100
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import JOB, write_results, report
+from corpus import generate_corpus
+
+COLUMNS = ["cv_id", "total_score"]
+
+
+def bench_loader(model_name="stub", threads=None, crash_marker=None, crash_after=None):
+    """Encoder for shard workers; with crash_marker the first worker to reach crash_after encodes exits."""
+    from common import load_encoder
+
+    encoder = load_encoder(model_name)
+    if not crash_marker:
+        return encoder
+
+    encode, calls = encoder.encode, [0]
+
+    def crashing_encode(*args, **kwargs):
+        calls[0] += 1
+        if calls[0] == crash_after:
+            try:
+                Path(crash_marker).touch(exist_ok=False)
+                os._exit(1)
+            except FileExistsError:
+                pass
+        return encode(*args, **kwargs)
+
+    encoder.encode = crashing_encode
+    return encoder
+
+
+def _ranked(df):
+    return df[COLUMNS].sort_values(["total_score", "cv_id"], ascending=[False, True]).reset_index(drop=True)
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from core.scorer import CVScorer
+    from core.shards import ShardCoordinator, start_local_workers
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=1000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--shard-size", type=int, default=100)
+    ap.add_argument("--k", type=int, default=20)
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--crash-after", type=int, default=3, help="encode calls before the injected crash")
+    ap.add_argument("--title-threshold", type=float, default=-1.0)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    corpus = generate_corpus(count=a.count)
+    items = [(p.name, p) for p in sorted(corpus.glob("*.pdf"))]
+    job = {**JOB, "title_sim_threshold": a.title_threshold}
+    stages = {}
+
+    t0 = time.perf_counter()
+    df = CVPipeline().run(corpus)
+    encoder = bench_loader(a.model)
+    reference = CVScorer(model=encoder, **job).score_dataframe(df).head(a.k)
+    single = time.perf_counter() - t0
+    stages["single"] = {"wall_s": round(single, 4), "cvs": len(items),
+                        "cvs_per_s": round(len(items) / single, 1)}
+
+    def sharded(n, **loader_kwargs):
+        with ShardCoordinator() as coordinator:
+            procs = start_local_workers(n, coordinator.address, coordinator.authkey, loader=bench_loader,
+                                        model_name=a.model, **loader_kwargs)
+            # model load di worker tidak ikut dihitung
+            while len(coordinator.workers) + len(coordinator._new) < n and any(p.is_alive() for p in procs):
+                time.sleep(0.05)
+            t0 = time.perf_counter()
+            top = coordinator.run(items, job, top_k=a.k, shard_size=a.shard_size,
+                                  dedup_threshold=None)
+            wall = time.perf_counter() - t0
+            stats = coordinator.stats
+        for p in procs:
+            p.join(timeout=10)
+        return top, wall, stats
+
+    for n in a.workers:
+        top, wall, stats = sharded(n)
+        stages[f"shards.{n}"] = {
+            "wall_s": round(wall, 4),
+            "cvs_per_s": round(len(items) / wall, 1),
+            "speedup": round(single / wall, 3),
+            "shards": stats["shards"],
+            "identical": _ranked(top).equals(_ranked(reference)),
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        n = max(2, max(a.workers))
+        top, wall, stats = sharded(n, crash_marker=str(Path(tmp) / "crashed"), crash_after=a.crash_after)
+        stages["shards.retry"] = {
+            "wall_s": round(wall, 4),
+            "workers": n,
+            "lost_workers": stats["lost_workers"],
+            "retries": stats["retries"],
+            "identical": _ranked(top).equals(_ranked(reference)),
+        }
+
+    out = write_results("shards", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Speculative decoding for the local GGUF model: tokens/sec and output equivalence.
+
+Generates AI-summary prompts (llm.build_summary_prompt over the synthetic
+corpus) with every draft mode at temperature 0 and compares each output with
+the plain (`off`) run. Needs a GGUF model (--model-path or MODEL_PATH); the
+`model` mode also needs --draft-model-path (same tokenizer family).
+
+    python benchmarks/bench_speculative.py --model-path models/qwen2.5-3b-q4.gguf \\
+        --draft-model-path models/qwen2.5-0.5b-q4.gguf --count 5 --max-tokens 192
+"""
+import os
+import gc
+import sys
+import time
+import argparse
+
+from common import JOB, write_results, report
+from corpus import generate_corpus
+
+
+def main(argv=None):
+    from core.parser import CVPipeline
+    from llm import DRAFT_MODES, build_summary_prompt, new_llama
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--model-path", default=os.getenv("MODEL_PATH"))
+    ap.add_argument("--draft-model-path", default=os.getenv("DRAFT_MODEL_PATH"))
+    ap.add_argument("--modes", nargs="+", choices=DRAFT_MODES, default=list(DRAFT_MODES))
+    ap.add_argument("--num-pred-tokens", type=int, default=None)
+    ap.add_argument("--count", type=int, default=5, help="summary prompts")
+    ap.add_argument("--max-tokens", type=int, default=192)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+    if not a.model_path:
+        ap.error("--model-path (or MODEL_PATH) is required")
+
+    df = CVPipeline().run(generate_corpus(count=a.count))
+    prompts = [
+        build_summary_prompt(row, JOB["job_title"], JOB["job_description"], JOB["required_skills"])
+        for _, row in df.iterrows()
+    ]
+
+    modes = ["off"] + [m for m in a.modes if m != "off"]
+    stages, reference = {}, None
+    for mode in modes:
+        if mode == "model" and not a.draft_model_path:
+            stages[f"generate.{mode}"] = {"error": "needs --draft-model-path"}
+            continue
+        try:
+            llm = new_llama(a.model_path, n_threads=a.threads, draft_mode=mode,
+                            draft_model_path=a.draft_model_path, draft_num_pred_tokens=a.num_pred_tokens)
+        except (ImportError, ValueError) as e:
+            stages[f"generate.{mode}"] = {"error": f"{type(e).__name__}: {e}"[:200]}
+            continue
+
+        texts, tokens = [], 0
+        t0 = time.perf_counter()
+        for prompt in prompts:
+            out = llm(prompt, max_tokens=a.max_tokens, temperature=0)
+            texts.append(out["choices"][0]["text"])
+            tokens += out["usage"]["completion_tokens"]
+        wall = time.perf_counter() - t0
+
+        rec = {"wall_s": round(wall, 4), "prompts": len(prompts), "completion_tokens": tokens,
+               "tokens_per_s": round(tokens / wall, 2) if wall else 0.0}
+        if reference is None:
+            reference = texts
+        else:
+            rec["identical"] = sum(x == y for x, y in zip(texts, reference))
+            rec["speedup"] = round(stages["generate.off"]["wall_s"] / wall, 3)
+        stages[f"generate.{mode}"] = rec
+
+        del llm
+        gc.collect()
+
+    out = write_results("speculative", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+UI startup benchmark.
+
+Measures, in a fresh interpreter each time:
+  * import time of the modules app/ui.py pulls in at the top level
+  * time for the first script run of app/ui.py to render the job form
+    (streamlit.testing AppTest, no browser needed; streamlit itself is
+    imported before the clock starts, as it is on a running server)
+and fails if torch / sentence-transformers / faiss / llama_cpp got imported
+before any analysis was requested.
+
+    python benchmarks/bench_startup.py --repeat 5 --budget 1.0
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+from common import APP_DIR, write_results, report
+
+HEAVY = ["torch", "sentence_transformers", "faiss", "llama_cpp", "transformers"]
+
+IMPORT_PROBE = f"""
+import sys, time, json
+sys.path.insert(0, {str(APP_DIR)!r})
+t0 = time.perf_counter()
+import core.parser, components, ai_summary, rag_utils, resources
+dt = time.perf_counter() - t0
+print(json.dumps({{"wall_s": dt, "heavy": [m for m in {HEAVY!r} if m in sys.modules]}}))
+"""
+
+RENDER_PROBE = f"""
+import sys, time, json
+sys.path.insert(0, {str(APP_DIR)!r})
+# A running server already has streamlit (and pandas) imported before any session starts
+import streamlit, pandas
+from streamlit.testing.v1 import AppTest
+t0 = time.perf_counter()
+at = AppTest.from_file({str(APP_DIR / "ui.py")!r}, default_timeout=120)
+at.run()
+dt = time.perf_counter() - t0
+ok = any(w.label == "Job Title" for w in at.sidebar.text_input)
+print(json.dumps({{"wall_s": dt, "form_rendered": ok, "exception": bool(at.exception),
+                  "heavy": [m for m in {HEAVY!r} if m in sys.modules]}}))
+"""
+
+
+def probe(code: str) -> dict:
+    out = subprocess.check_output([sys.executable, "-c", code], text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(name, code, repeat, stages):
+    runs = [probe(code) for _ in range(repeat)]
+    walls = [r["wall_s"] for r in runs]
+    stages[name] = {
+        "wall_s": round(statistics.median(walls), 4),
+        "min_s": round(min(walls), 4),
+        "heavy_imports": sorted({m for r in runs for m in r["heavy"]}),
+        **{k: v for k, v in runs[-1].items() if k not in ("wall_s", "heavy")},
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--budget", type=float, default=1.0, help="max seconds for the first render")
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    stages = {}
+    measure("startup.import", IMPORT_PROBE, a.repeat, stages)
+    measure("startup.first_render", RENDER_PROBE, a.repeat, stages)
+
+    out = write_results("startup", {"repeat": a.repeat, "budget": a.budget}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+
+    failed = False
+    for name, rec in stages.items():
+        if rec["heavy_imports"]:
+            print(f"FAIL {name}: heavy modules imported at startup: {rec['heavy_imports']}")
+            failed = True
+    render = stages["startup.first_render"]
+    if render["wall_s"] > a.budget:
+        print(f"FAIL first render took {render['wall_s']:.3f}s (budget {a.budget:.3f}s)")
+        failed = True
+    if not render.get("form_rendered", True) or render.get("exception"):
+        print("FAIL job form did not render cleanly")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Summary scoring: the original per-CV scorer (eight re.sub fluff passes per
+sentence, the summary lower-cased per highlight keyword, one encode() per CV)
+vs CVScorer.score_summaries (one fluff regex, distinct chunks of the pool
+embedded together, per-CV max via np.maximum.reduceat, one keyword scan).
+
+Summaries come from the corpus generator (no PDFs), with fluff phrases, empty
+summaries and overlapping keywords ("dashboard" / "dashboards") mixed in.
+Stages per pool size:
+
+* summary.<n>.per_row / pooled              – encoder included, no prefetch
+* summary.<n>.per_row_sched / pooled_sched  – after the scheduled pool prefetch
+                                              (the score_dataframe path)
+
+`max_abs_diff` compares with the original scorer.
+
+    python benchmarks/bench_summary.py --counts 1000 10000 --model stub
+"""
+import re
+import sys
+import time
+import random
+import argparse
+
+import numpy as np
+
+from common import JOB, load_encoder, write_results, report
+from corpus import make_cv
+
+FLUFF = [
+    "Dedicated professional with {n} years of experience.",
+    "Hardworking analyst seeking a new opportunity.",
+    "Proven track record.",
+    "",
+]
+KEYWORDS = JOB["highlight_keywords"] + ["dashboards", "data", "SQL"]
+
+
+def make_summaries(n, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            out.append(None)
+            continue
+        fluff = rng.choice(FLUFF).format(n=rng.randint(1, 12))
+        out.append((fluff + " " + make_cv(rng, summary_sentences=rng.randint(1, 4))["summary"]).strip())
+    return out
+
+
+def original_summary_raw(scorer, summary):
+    """score_summary_raw as it was before score_summaries."""
+    import pandas as pd
+    from sentence_transformers import util
+
+    if not summary or pd.isna(summary):
+        return 0.0
+
+    def clean(text):
+        fluff = [
+            "professional", "dedicated", "hardworking", "seeking",
+            "opportunity", "proven", "years", "experience"
+        ]
+        text = str(text).lower()
+        for w in fluff:
+            text = re.sub(rf"\b{w}\b", "", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    chunks = [clean(c.strip()) for c in str(summary).replace("\n", ".").split(".") if len(c.strip()) > 10]
+    if not chunks:
+        return 0.0
+    sims = util.pytorch_cos_sim(scorer._encode(chunks), scorer.job_desc_emb)
+    bonus = sum(0.5 for kw in scorer.highlight_keywords if kw.lower() in summary.lower())
+    return max(sims.flatten().tolist()) + bonus
+
+
+def main(argv=None):
+    import pandas as pd
+    from core.scorer import CVScorer
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--model", default="stub")
+    ap.add_argument("--out", default=None)
+    a = ap.parse_args(argv)
+
+    encoder = load_encoder(a.model)
+    job = {**JOB, "highlight_keywords": KEYWORDS}
+    stages = {}
+
+    for n in a.counts:
+        summaries = pd.Series(make_summaries(n))
+        reference = None
+        for mode in ("per_row", "pooled", "per_row_sched", "pooled_sched"):
+            scorer = CVScorer(model=encoder, **job)
+            t0 = time.perf_counter()
+            if mode.endswith("_sched"):
+                scorer.prefetch([c for s in summaries for c in scorer._summary_chunks(s)])
+                fn = scorer.score_summary_raw
+            else:
+                fn = lambda s: original_summary_raw(scorer, s)
+            out = scorer.score_summaries(summaries) if mode.startswith("pooled") else summaries.map(fn).to_numpy()
+            wall = time.perf_counter() - t0
+
+            rec = {"wall_s": round(wall, 4), "cvs": n, "encode_calls": scorer.encode_stats["encode_calls"]}
+            if reference is None:
+                reference = (out, wall)
+            else:
+                rec["speedup"] = round(reference[1] / wall, 2)
+                rec["max_abs_diff"] = float(np.max(np.abs(out - reference[0])))
+            stages[f"summary.{n}.{mode}"] = rec
+
+    out = write_results("summary", {k: v for k, v in vars(a).items() if k != "out"}, stages, a.out)
+    report(stages)
+    print(f"results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import sys
+import json
+import time
+import platform
+import subprocess
+from pathlib import Path
+from contextlib import contextmanager
+
+BENCH_DIR = Path(__file__).parent
+PROJECT_DIR = BENCH_DIR.parent
+APP_DIR = PROJECT_DIR / "app"
+RESULTS_DIR = BENCH_DIR / "results"
+CORPUS_DIR = BENCH_DIR / "corpus"
+
+# Modul aplikasi diimport seperti di ui.py (app/ sebagai root)
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+JOB = {
+    "job_title": "data analyst",
+    "job_description": (
+        "Analyze business data with SQL and Python, build dashboards, "
+        "report insights to stakeholders and maintain data pipelines."
+    ),
+    "required_skills": ["sql", "python", "tableau", "statistics", "excel"],
+    "highlight_keywords": ["dashboard", "sql", "stakeholder"],
+    "weights": {"experience": 0.4, "skills": 0.3, "summary": 0.2, "education": 0.1},
+}
+
+
+@contextmanager
+def timed(results: dict, name: str, **fields):
+    t0 = time.perf_counter()
+    rec = dict(fields)
+    try:
+        yield rec
+    finally:
+        rec["wall_s"] = round(time.perf_counter() - t0, 6)
+        results[name] = rec
+
+
+def load_encoder(name: str):
+    if name == "stub":
+        from stub_model import StubEncoder
+        return StubEncoder()
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(name: str, params: dict, stages: dict, out=None) -> Path:
+    payload = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": params,
+        "stages": stages,
+    }
+    out = Path(out) if out else RESULTS_DIR / f"{name}-{payload['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, indent=2))
+    return out
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.2, min_abs_s: float = 0.05):
+    """
+    Compare stage wall times against a baseline result file.
+    A stage regresses if it is `threshold` slower AND at least `min_abs_s` seconds slower.
+    """
+    regressions = []
+    for stage, rec in current["stages"].items():
+        base = baseline["stages"].get(stage)
+        if not base or "wall_s" not in rec or "wall_s" not in base:
+            continue
+        cur_s, base_s = rec["wall_s"], base["wall_s"]
+        if cur_s > base_s * (1 + threshold) and cur_s - base_s > min_abs_s:
+            regressions.append({
+                "stage": stage,
+                "baseline_s": base_s,
+                "current_s": cur_s,
+                "ratio": round(cur_s / base_s, 3) if base_s else None,
+            })
+    return regressions
+
+
+def report(stages: dict):
+    width = max((len(k) for k in stages), default=10)
+    for name, rec in stages.items():
+        extra = ", ".join(f"{k}={v}" for k, v in rec.items() if k != "wall_s")
+        print(f"  {name:<{width}}  {rec.get('wall_s', 0):>10.4f}s  {extra}")
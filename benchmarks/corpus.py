@@ -0,0 +1,206 @@
+"""
+Synthetic CV corpus generator.
+
+Writes PDFs in the layout CVPipeline.FEATURE_HEADERS expects (title line, then
+Summary / Experience / Skills / Education sections) plus a manifest.json with
+the ground-truth sections of every CV.
+
+    python benchmarks/corpus.py --count 1000 --out benchmarks/corpus/1000
+"""
+import json
+import random
+import argparse
+import textwrap
+from pathlib import Path
+
+import fitz
+
+from common import CORPUS_DIR
+
+TITLES = [
+    "Data Analyst", "Senior Data Analyst", "Business Analyst", "Data Scientist",
+    "Software Engineer", "Accountant", "Marketing Manager", "HR Generalist",
+    "Financial Analyst", "Project Manager", "BI Developer", "Sales Executive",
+]
+SKILLS = [
+    "sql", "python", "excel", "tableau", "power bi", "statistics", "r", "java",
+    "communication", "leadership", "accounting", "forecasting", "etl", "spark",
+    "machine learning", "budgeting", "negotiation", "recruiting", "seo", "aws",
+]
+VERBS = ["built", "designed", "maintained", "automated", "analyzed", "led", "reported", "improved"]
+OBJECTS = [
+    "sales dashboards", "sql data pipelines", "monthly financial reports", "customer churn models",
+    "marketing campaigns", "stakeholder presentations", "etl jobs", "recruitment funnels",
+    "inventory forecasts", "a/b test analyses", "budget plans", "kpi scorecards",
+]
+OUTCOMES = [
+    "for regional managers", "reducing manual work by 30 percent", "across five business units",
+    "using python and sql", "for executive stakeholders", "with weekly refresh cycles",
+]
+SCHOOLS = ["Universitas Indonesia", "State University", "Institute of Technology", "City College"]
+DEGREES = ["Bachelor of Science in Statistics", "Master of Business Administration",
+           "Bachelor of Arts in Economics", "Diploma in Accounting"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+HEADER_VARIANTS = {
+    "summary": ["Summary", "Professional Summary", "Profile"],
+    "experience": ["Experience", "Work Experience", "Professional Experience"],
+    "skills": ["Skills", "Technical Skills", "Skill Highlights"],
+    "education": ["Education", "Education and Training"],
+}
+
+
+def _sentence(rng):
+    return f"{rng.choice(VERBS).capitalize()} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}."
+
+
+def make_cv(rng, summary_sentences=3, jobs=2, bullets_per_job=4, n_skills=8):
+    title = rng.choice(TITLES)
+    summary = " ".join(_sentence(rng) for _ in range(summary_sentences))
+
+    experience = []
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2024 else f"{rng.choice(MONTHS)} {year}"
+        role = title if rng.random() < 0.6 else rng.choice(TITLES)
+        experience.append({
+            "header": f"{role}, Company {rng.randint(1, 999)} {rng.choice(MONTHS)} {start} to {end}",
+            "bullets": [_sentence(rng) for _ in range(bullets_per_job)],
+        })
+        year = start
+
+    return {
+        "title": title,
+        "summary": summary,
+        "experience": experience,
+        "skills": rng.sample(SKILLS, min(n_skills, len(SKILLS))),
+        "education": f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} {rng.randint(2005, 2020)}",
+    }
+
+
+class _Writer:
+    """Very small line-based PDF layout: wraps text and breaks pages."""
+
+    TOP, BOTTOM, LEFT = 60, 800, 50
+
+    def __init__(self):
+        self.doc = fitz.open()
+        self._page()
+
+    def _page(self):
+        self.page = self.doc.new_page(width=595, height=842)
+        self.y = self.TOP
+
+    def line(self, text, size=10, bold=False, gap=4):
+        if self.y + size > self.BOTTOM:
+            self._page()
+        self.page.insert_text((self.LEFT, self.y), text, fontsize=size,
+                              fontname="hebo" if bold else "helv")
+        self.y += size + gap
+
+    def para(self, text, size=10, width=95):
+        for ln in textwrap.wrap(text, width) or [""]:
+            self.line(ln, size=size)
+
+    def save(self, path):
+        self.doc.save(path)
+        self.doc.close()
+
+
+def render_pdf(cv: dict, path: Path, rng, appendix_pages: int = 0, distractors: bool = False):
+    """
+    distractors=True adds plain body lines that equal a header alias (e.g. a wrapped
+    "Training" line inside experience) which only layout-aware extraction can reject.
+    """
+    w = _Writer()
+    w.line(cv["title"], size=16, bold=True, gap=10)
+
+    w.line(rng.choice(HEADER_VARIANTS["summary"]), size=12, bold=True)
+    w.para(cv["summary"])
+
+    w.line(rng.choice(HEADER_VARIANTS["experience"]), size=12, bold=True)
+    for job in cv["experience"]:
+        w.para(job["header"])
+        for b in job["bullets"]:
+            w.para("• " + b)
+        if distractors:
+            w.para("Delivered internal workshops as part of")
+            w.line("training")
+
+    w.line(rng.choice(HEADER_VARIANTS["skills"]), size=12, bold=True)
+    w.para(" • ".join(cv["skills"]))
+
+    w.line(rng.choice(HEADER_VARIANTS["education"]), size=12, bold=True)
+    w.para(cv["education"])
+
+    for i in range(appendix_pages):
+        w._page()
+        w.line("Portfolio" if i == 0 else "Appendix", size=12, bold=True)
+        for _ in range(40):
+            w.para(_sentence(rng))
+
+    w.save(path)
+
+
+def generate_corpus(
+    out_dir=None,
+    count: int = 100,
+    seed: int = 0,
+    summary_sentences: int = 3,
+    jobs: int = 2,
+    bullets_per_job: int = 4,
+    n_skills: int = 8,
+    appendix_pages: int = 0,
+    duplicate_rate: float = 0.0,
+    distractors: bool = False,
+) -> Path:
+    """
+    Generate `count` CV PDFs (cached: an existing corpus with the same params is reused).
+    duplicate_rate > 0 re-emits that fraction of CVs under a new file name.
+    """
+    params = dict(count=count, seed=seed, summary_sentences=summary_sentences, jobs=jobs,
+                  bullets_per_job=bullets_per_job, n_skills=n_skills,
+                  appendix_pages=appendix_pages, duplicate_rate=duplicate_rate, distractors=distractors)
+    out_dir = Path(out_dir) if out_dir else CORPUS_DIR / "-".join(f"{v}" for v in params.values())
+    manifest_path = out_dir / "manifest.json"
+
+    if manifest_path.exists() and json.loads(manifest_path.read_text()).get("params") == params:
+        return out_dir
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    cvs = {}
+
+    for i in range(count):
+        name = f"cv_{i:05d}.pdf"
+        if cvs and rng.random() < duplicate_rate:
+            src = rng.choice(list(cvs))
+            cv = cvs[src]
+        else:
+            cv = make_cv(rng, summary_sentences, jobs, bullets_per_job, n_skills)
+        render_pdf(cv, out_dir / name, random.Random(f"{seed}-{i}"), appendix_pages, distractors)
+        cvs[name] = cv
+
+    manifest_path.write_text(json.dumps({"params": params, "cvs": cvs}, indent=1))
+    return out_dir
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--count", type=int, default=100)
+    ap.add_argument("--out", default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--summary-sentences", type=int, default=3)
+    ap.add_argument("--jobs", type=int, default=2)
+    ap.add_argument("--bullets-per-job", type=int, default=4)
+    ap.add_argument("--skills", type=int, default=8)
+    ap.add_argument("--appendix-pages", type=int, default=0)
+    ap.add_argument("--duplicate-rate", type=float, default=0.0)
+    ap.add_argument("--distractors", action="store_true")
+    a = ap.parse_args()
+
+    path = generate_corpus(a.out, a.count, a.seed, a.summary_sentences, a.jobs,
+                           a.bullets_per_job, a.skills, a.appendix_pages, a.duplicate_rate,
+                           a.distractors)
+    print(path)
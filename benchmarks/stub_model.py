@@ -0,0 +1,55 @@
+import re
+import zlib
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class StubEncoder:
+    """
+    Offline stand-in for SentenceTransformer.
+
+    Hashes word unigrams and bigrams into a fixed-size vector, so similar texts
+    still get similar embeddings. Only meant for timing the pipeline without
+    downloading a model; scores are not comparable with MiniLM.
+    """
+
+    def __init__(self, dim: int = 384, max_seq_length: int = 256):
+        self.dim = dim
+        self.max_seq_length = max_seq_length
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        tokens = _TOKEN.findall(str(text).lower())[: self.max_seq_length]
+        grams = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+        for g in grams:
+            h = zlib.crc32(g.encode())
+            vec[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        return vec
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        convert_to_tensor: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        embs = np.stack([self._embed(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embs, axis=1, keepdims=True)
+            embs = embs / np.where(norms == 0, 1, norms)
+
+        if single:
+            embs = embs[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embs)
+        return embs
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Modul aplikasi diimport seperti di ui.py (app/ sebagai root)
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
@@ -0,0 +1,25 @@
+import pytest
+
+from cli import main
+
+
+def test_empty_folder_exits_without_scoring(tmp_path, capsys):
+    out = tmp_path / "ranked.csv"
+    (tmp_path / "cvs").mkdir()
+
+    code = main(["--input", str(tmp_path / "cvs"), "--job-title", "data analyst", "--out", str(out)])
+
+    assert code == 1
+    assert not out.exists()
+    assert "no PDFs found" in capsys.readouterr().err
+
+
+def test_encode_workers_rejected_in_sharded_mode(tmp_path, capsys):
+    args = ["--input", str(tmp_path), "--job-title", "data analyst", "--out", str(tmp_path / "ranked.csv"),
+            "--shard-workers", "2", "--encode-workers", "2"]
+
+    with pytest.raises(SystemExit) as exc:
+        main(args)
+
+    assert exc.value.code == 2
+    assert "--encode-workers" in capsys.readouterr().err
@@ -0,0 +1,17 @@
+from core.parser import CVPipeline
+
+
+def test_language_headers_are_opt_in():
+    assert CVPipeline().header_index.get("pengalaman kerja") is None
+    assert CVPipeline(languages=("id",)).header_index["pengalaman kerja"] == "experience"
+
+
+def test_cache_key_includes_languages(tmp_path):
+    data = b"%PDF-1.4 same bytes"
+
+    english = CVPipeline()._cache_path(data, tmp_path)
+    indonesian = CVPipeline(languages=("id",))._cache_path(data, tmp_path)
+
+    assert english != indonesian
+    assert english.parent.name.split("-")[2] == "en"
+    assert indonesian.parent.name.split("-")[2] == "id"